@@ -0,0 +1,77 @@
+# benchmarks/startup.py
+
+"""
+Startup-time benchmark.
+
+Measures cold import time of `src.main` (in fresh interpreters) and the
+latency of the first HTTP request served by the application:
+
+    python -m benchmarks.startup --runs 5
+    python -m benchmarks.startup --path "/aquarium/customers?email=user@example.com"
+
+The first-request path defaults to `/status`; point it at an `/aquarium/*`
+route to include lazy Aquarium client construction in the measurement.
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+IMPORT_SNIPPET = (
+    "import time; started = time.perf_counter(); import src.main; "
+    "print(time.perf_counter() - started)"
+)
+
+FIRST_REQUEST_SNIPPET = """
+import sys, time
+from fastapi.testclient import TestClient
+import src.main
+client = TestClient(src.main.app)
+started = time.perf_counter()
+response = client.get(sys.argv[1])
+print(time.perf_counter() - started, response.status_code)
+"""
+
+
+def _run(snippet: str, *args: str) -> list[str]:
+    """Run `snippet` in a fresh interpreter and return its whitespace-split output."""
+    output = subprocess.run(
+        [sys.executable, "-c", snippet, *args],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return output.strip().splitlines()[-1].split()
+
+
+def _summary(label: str, samples: list[float]) -> str:
+    """Format min/median/max of `samples` (in seconds) as milliseconds."""
+    return (
+        f"{label:<16} min={min(samples) * 1000:8.1f}ms "
+        f"median={statistics.median(samples) * 1000:8.1f}ms "
+        f"max={max(samples) * 1000:8.1f}ms"
+    )
+
+
+def main() -> None:
+    """Entry-point for the startup benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", maxsplit=1)[0])
+    parser.add_argument("--runs", type=int, default=5, help="Number of cold starts to measure")
+    parser.add_argument("--path", default="/status", help="Path requested for first-request latency")
+    args = parser.parse_args()
+
+    wall_started = time.perf_counter()
+    imports = [float(_run(IMPORT_SNIPPET)[0]) for _ in range(args.runs)]
+    first_requests = []
+    for _ in range(args.runs):
+        elapsed, status_code = _run(FIRST_REQUEST_SNIPPET, args.path)
+        first_requests.append(float(elapsed))
+    print(_summary("import src.main", imports))
+    print(_summary(f"first {args.path}", first_requests) + f" (HTTP {status_code})")
+    print(f"total wall time {time.perf_counter() - wall_started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+# src/admin_routes.py
+"""
+Admin-only diagnostics routes (sampling profiler, slow tool calls).
+
+Every route requires the `X-Admin-Token` header to match `ADMIN_TOKEN`;
+when no token is configured the routes answer 404 as if they did not exist.
+"""
+import asyncio
+import secrets
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+from src.aq_mcp_server import slow_calls
+from src.config import config
+from src.helpers.profiling import SamplingProfiler
+
+
+async def require_admin(x_admin_token: str | None = Header(None)) -> None:
+    """Reject requests that don't carry the configured admin token."""
+    if not config.ADMIN_TOKEN:
+        raise HTTPException(status_code=404)
+    if not x_admin_token or not secrets.compare_digest(x_admin_token, config.ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Invalid admin token.")
+
+
+# Create a router for admin endpoints, hidden from the public OpenAPI schema
+router = APIRouter(
+    prefix="/admin",
+    tags=["Admin"],
+    include_in_schema=False,
+    dependencies=[Depends(require_admin)],
+)
+
+profiler = SamplingProfiler(max_duration=config.PROFILER_MAX_SECONDS)
+
+
+@router.post("/profiler/start")
+async def start_profiler(interval: float = Query(0.005, gt=0, le=1)):
+    """Start the sampling profiler, discarding any previous samples."""
+    if profiler.running:
+        raise HTTPException(status_code=409, detail="Profiler is already running.")
+    profiler.interval = interval
+    profiler.start()
+    return {"status": "started", "interval": interval, "max_duration": profiler.max_duration}
+
+
+@router.post("/profiler/stop")
+async def stop_profiler():
+    """Stop the sampling profiler."""
+    await asyncio.to_thread(profiler.stop)
+    return {"status": "stopped", "samples": profiler.samples}
+
+
+@router.get("/profiler/profile")
+async def download_profile():
+    """Download the collected samples as folded stacks for flamegraph tools."""
+    return PlainTextResponse(
+        profiler.folded(),
+        headers={"Content-Disposition": 'attachment; filename="profile.folded"'},
+    )
+
+
+@router.get("/slow-calls")
+async def list_slow_calls(limit: int | None = Query(None, ge=1)):
+    """Return captured slow tool calls, most recent first."""
+    return {"threshold": slow_calls.threshold, "calls": slow_calls.entries(limit)}
+
+
+@router.delete("/slow-calls")
+async def clear_slow_calls():
+    """Forget all captured slow tool calls."""
+    slow_calls.clear()
+    return {"status": "cleared"}
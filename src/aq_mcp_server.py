@@ -3,22 +3,197 @@
 Aquarium MCP tool definitions and HTTP endpoint wrappers.
 """
 
-from typing import Any
+from typing import Any, AsyncIterator, Callable
+import asyncio
+import contextlib
+import functools
+import hashlib
 import inspect
-from fastapi import APIRouter, Query
+import json
+import re
+import time
+import pydantic_core
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import FileResponse, StreamingResponse
 from mcp.server.fastmcp import FastMCP
 from aquarium.clients.aquarium_client import AquariumClient  # pylint: disable=import-error
+from src.config import config
+from src.helpers.async_client import AsyncAquariumClient, UpstreamTimeout, track_detached
+from src.helpers.change_feed import ChangeFeed, Subscription, Topic
+from src.helpers.compaction import compact_result
+from src.helpers.http_cache import CachingRoute
+from src.helpers.lazy_client import LazyClient
 from src.helpers.logger import get_logger
+from src.helpers.profiling import SlowCallLog, phase
+from src.helpers.rate_limit import (
+    BATCH,
+    INTERACTIVE,
+    ClientIdentity,
+    FairScheduler,
+    RateLimiter,
+    current_client,
+    parse_tool_rates,
+)
+from src.helpers.replay import (
+    FALLBACK,
+    RECORD,
+    REPLAY,
+    ReplayClient,
+    ReplayStore,
+    track_fallbacks,
+)
+from src.helpers.schema_cache import SchemaCache
+from src.helpers.spill import SpillStore
 
 # Initialize FastMCP server
 mcp = FastMCP("aquarium")
 
-router = APIRouter(prefix="/aquarium", tags=["Aquarium"])
-aquarium_client = AquariumClient()
+
+def _setting_list(value: str) -> set[str]:
+    """Split a comma-separated setting into a set of non-empty entries."""
+    return {item.strip() for item in value.split(",") if item.strip()}
+
+def _key_digest(api_key: str) -> str:
+    """Return the short hash used to identify an API key in bucket keys."""
+    return hashlib.sha256(api_key.encode()).hexdigest()[:16]
+
+def _client_address(request: Request) -> str:
+    """Return the caller's address, honouring `X-Forwarded-For` from trusted proxies.
+
+    The forwarded chain is walked right to left and the first hop that isn't
+    one of `TRUSTED_PROXIES` is the client; headers from untrusted peers are
+    ignored so callers can't pick their own bucket.
+    """
+    host = request.client.host if request.client else "unknown"
+    trusted = _setting_list(config.TRUSTED_PROXIES)
+    if host not in trusted:
+        return host
+    forwarded = [hop.strip() for hop in request.headers.get("x-forwarded-for", "").split(",")]
+    for hop in reversed(forwarded):
+        if hop and hop not in trusted:
+            return hop
+    return host
+
+async def _hold_result_memory() -> AsyncIterator[None]:
+    """Keep the memory reserved for tool results until the response has been encoded."""
+    with spill_store.reservation():
+        yield
+
+async def _identify_client(request: Request) -> None:
+    """Attribute a REST request to a client for rate limiting and scheduling.
+
+    Clients presenting an `X-API-Key` listed in `API_KEYS` or `BATCH_API_KEYS`
+    are keyed by that key (hashed); everyone else, including callers with an
+    unknown key, is keyed by their address. Validated keys listed in
+    `BATCH_API_KEYS`, or requests sent with `X-Client-Priority: batch`, are
+    scheduled as batch work.
+    """
+    api_key = request.headers.get("x-api-key", "")
+    digest = _key_digest(api_key) if api_key else ""
+    batch_keys = {_key_digest(k) for k in _setting_list(config.BATCH_API_KEYS)}
+    known_keys = batch_keys | {_key_digest(k) for k in _setting_list(config.API_KEYS)}
+    if digest and digest in known_keys:
+        key = "key:" + digest
+    else:
+        key = "ip:" + _client_address(request)
+    is_batch = digest in batch_keys or request.headers.get("x-client-priority") == BATCH
+    current_client.set(ClientIdentity(key, BATCH if is_batch else INTERACTIVE))
+
+router = APIRouter(
+    prefix="/aquarium",
+    tags=["Aquarium"],
+    dependencies=[Depends(_identify_client), Depends(_hold_result_memory)],
+    route_class=CachingRoute,
+)
 
 
 logger = get_logger(__name__)
 
+def _parsed_schema(client: Any) -> Any:
+    """Return the parsed service definition (zeep `Document`) of an Aquarium client, or ``None``."""
+    for owner in (client, getattr(client, "client", None), getattr(client, "_client", None)):
+        document = getattr(owner, "wsdl", None)
+        if document is not None and not isinstance(document, str):
+            return document
+    return None
+
+def _new_aquarium_client(schema: Any | None) -> AquariumClient:
+    """Construct and authenticate a fresh AquariumClient around a cached service definition.
+
+    Falls back to a full build (and WSDL parse) if the client doesn't accept
+    a pre-parsed definition.
+    """
+    if schema is not None:
+        try:
+            return AquariumClient(wsdl=schema)
+        except TypeError as exc:
+            logger.info("AquariumClient can't reuse the cached schema, parsing the WSDL: %s", exc)
+    return AquariumClient()
+
+def _build_upstream_client() -> AquariumClient | AsyncAquariumClient:
+    """Construct the Aquarium client, reusing the on-disk schema cache when configured.
+
+    In the default ``async`` client mode the client is wrapped in
+    `AsyncAquariumClient` so calls don't block the event loop.
+    """
+    if config.AQUARIUM_WSDL_URL and config.AQUARIUM_SCHEMA_CACHE_DIR:
+        cache = SchemaCache(config.AQUARIUM_SCHEMA_CACHE_DIR, config.AQUARIUM_WSDL_URL)
+        client = cache.load_or_build(_new_aquarium_client, _parsed_schema)
+    else:
+        client = AquariumClient()
+    if config.AQUARIUM_CLIENT_MODE == "async":
+        return AsyncAquariumClient(
+            client, max_workers=config.AQUARIUM_MAX_WORKERS, timeout=config.AQUARIUM_TIMEOUT
+        )
+    return client
+
+def _build_client() -> AquariumClient | AsyncAquariumClient | ReplayClient:
+    """Construct the client used by the tools, honouring `AQUARIUM_REPLAY_MODE`.
+
+    In ``record``, ``fallback`` and ``replay`` modes the upstream client is
+    wrapped in a `ReplayClient`; it stays lazy so replay never constructs it
+    and the other modes can fall back to recorded responses if construction
+    fails. Retention limits apply to the modes that write to the store.
+    """
+    mode = config.AQUARIUM_REPLAY_MODE
+    if mode not in (RECORD, FALLBACK, REPLAY):
+        return _build_upstream_client()
+    if mode == REPLAY:
+        store = ReplayStore(config.AQUARIUM_REPLAY_PATH)
+    else:
+        store = ReplayStore(
+            config.AQUARIUM_REPLAY_PATH,
+            max_age=config.AQUARIUM_REPLAY_MAX_AGE,
+            max_rows=config.AQUARIUM_REPLAY_MAX_ROWS,
+        )
+    return ReplayClient(
+        LazyClient(_build_upstream_client, name="AquariumClient"),
+        store,
+        mode=mode,
+        latency_scale=config.AQUARIUM_REPLAY_LATENCY_SCALE,
+        refresh_interval=config.AQUARIUM_FALLBACK_REFRESH,
+    )
+
+# Built on first use so importing this module does not hit the SOAP API
+aquarium_client = LazyClient(_build_client, name="AquariumClient")
+
+rate_limiter = RateLimiter(
+    config.RATE_LIMIT_PER_SECOND,
+    config.RATE_LIMIT_BURST,
+    parse_tool_rates(config.RATE_LIMIT_TOOL_RATES),
+)
+upstream_scheduler = FairScheduler(config.UPSTREAM_MAX_CONCURRENCY)
+
+slow_calls = SlowCallLog(config.SLOW_CALL_THRESHOLD, maxlen=config.SLOW_CALL_BUFFER_SIZE)
+
+spill_store = SpillStore(
+    config.RESULT_SPILL_DIR,
+    request_budget=config.RESULT_REQUEST_BUDGET,
+    global_budget=config.RESULT_GLOBAL_BUDGET,
+    preview_items=config.RESULT_PREVIEW_ITEMS,
+    ttl=config.RESULT_SPILL_TTL,
+)
+
 # Helper to convert arbitrary Aquarium model instances to plain dictionaries
 def _to_dict(obj: Any) -> dict[str, Any]:
     """Convert any Aquarium SDK / Pydantic object to a plain `dict`.
@@ -33,81 +208,280 @@ def _to_dict(obj: Any) -> dict[str, Any]:
         return obj.__dict__
     return {"value": obj}
 
+async def _maybe_await(result):
+    """Await the result if it's awaitable, otherwise return it directly."""
+    if inspect.isawaitable(result):
+        return await result
+    return result
+
+async def _upstream_client() -> Any:
+    """Return the Aquarium client, constructing it off-loop on first use."""
+    if isinstance(aquarium_client, LazyClient):
+        return await aquarium_client.aget()
+    return aquarium_client
+
+def _charge_rate_limit(tool: str) -> None:
+    """Consume one request of the current client's budget for `tool`.
+
+    Raises:
+        RateLimitExceeded: If the current client is over its limit for `tool`.
+    """
+    identity = current_client.get()
+    if identity.rate_limited:
+        rate_limiter.check(identity.key, tool)
+
+async def _upstream(method: str, *args: Any, **kwargs: Any) -> Any:
+    """Call `method` on the Aquarium client and return its (awaited) result.
+
+    Rate limits are charged per tool call by `_mcp_tool`, not here, so the
+    upstream calls a tool plans (e.g. one per customer) cost a single request.
+    """
+    identity = current_client.get()
+    client = await _upstream_client()
+    with phase("queue"):
+        await upstream_scheduler.acquire(identity)
+    # The scheduler slot follows the upstream work, not this caller: it is
+    # freed only once a timed-out or cancelled call has really finished, even
+    # if the timeout was answered from the replay fallback.
+    with track_detached() as detached:
+        work = asyncio.ensure_future(_maybe_await(getattr(client, method)(*args, **kwargs)))
+    work.add_done_callback(functools.partial(_release_upstream_slot, detached))
+    with phase("upstream"):
+        return await asyncio.shield(work)
+
+def _release_upstream_slot(detached: list[asyncio.Future], work: asyncio.Future) -> None:
+    """Free the scheduler slot of `work`, deferring it while a worker thread of it still runs."""
+    exc = None if work.cancelled() else work.exception()
+    if isinstance(exc, UpstreamTimeout) and exc.pending is not None:
+        detached.append(exc.pending)
+    running = [pending for pending in detached if not pending.done()]
+    if running:
+        asyncio.gather(*running, return_exceptions=True).add_done_callback(
+            lambda _running: upstream_scheduler.release()
+        )
+    else:
+        upstream_scheduler.release()
+
+async def warm_up_client() -> None:
+    """Construct the Aquarium client ahead of the first request."""
+    try:
+        await _upstream_client()
+    except Exception as exc:  # pylint: disable=broad-exception-caught
+        logger.warning("Aquarium client warm-up failed: %s", exc)
+
+async def _render(
+    tool: str, items: list[Any], convert: Callable[[Any], Any] = _to_dict
+) -> list[Any] | dict[str, Any]:
+    """Convert a list result off the event loop within the memory budgets.
+
+    Oversized results are spilled to disk and replaced by a preview plus the
+    resource URI / URL of the full payload.
+    """
+    with phase("convert"):
+        rows, spilled = await asyncio.to_thread(spill_store.collect, tool, items, convert)
+    if spilled is None:
+        return rows
+    return {**spilled.describe(), "preview": rows}
+
+def _compact(tool: str, result: Any) -> Any:
+    """Apply the configured compaction stage to an MCP tool result."""
+    if not config.COMPACT_TOOL_RESULTS:
+        return result
+    if isinstance(result, dict) and "resource_uri" in result:
+        return {**result, "preview": compact_result(tool, result["preview"], config.COMPACT_MAX_ITEMS)}
+    return compact_result(tool, result, config.COMPACT_MAX_ITEMS)
+
+def _encode_for_mcp(result: Any) -> Any:
+    """Encode a tool result the way FastMCP would, so it can be done inside the memory reservation.
+
+    Lists stay lists (FastMCP sends one text content per item); everything
+    else becomes its JSON text.
+    """
+    if isinstance(result, (list, tuple)):
+        return [_encode_for_mcp(item) for item in result]
+    if result is None or isinstance(result, str):
+        return result
+    return json.dumps(pydantic_core.to_jsonable_python(result))
+
+# MCP-facing tool callables by name; the REST wrappers call the bare functions.
+mcp_tools: dict[str, Callable[..., Any]] = {}
+
+def _mcp_tool(func: Callable[..., Any]) -> Callable[..., Any]:
+    """Register `func` as a rate-limited MCP tool whose results go through the compaction stage.
+
+    Each call is charged once against the caller's rate limit for the tool.
+    Results built from last-known-good fallback responses are wrapped with
+    ``stale``/``recorded_at`` metadata.
+    The returned, uncompacted function is what the `/aquarium/*` REST wrappers
+    call, so they keep serving the full, documented payload shape.
+    """
+    @functools.wraps(func)
+    async def limited(*args: Any, **kwargs: Any) -> Any:
+        _charge_rate_limit(func.__name__)
+        return await func(*args, **kwargs)
+
+    @functools.wraps(func)
+    async def compacted(*args: Any, **kwargs: Any) -> Any:
+        with spill_store.reservation(), track_fallbacks() as fallback:
+            result = await limited(*args, **kwargs)
+            with phase("compact"):
+                result = _compact(func.__name__, result)
+            if fallback.stale:
+                # Served from the last-known-good fallback: say so, and since when.
+                result = {**fallback.to_dict(), "result": result}
+            with phase("encode"):
+                return _encode_for_mcp(result)
+
+    # Capture again around the compaction stage so the MCP path's slow-call
+    # entries include compaction and encoding.
+    compacted = slow_calls.capture(compacted)
+    mcp_tools[func.__name__] = compacted
+    mcp.tool()(compacted)
+    return limited
+
+@contextlib.asynccontextmanager
+async def _task_group():
+    """`asyncio.TaskGroup` that raises the first failure itself instead of an `ExceptionGroup`.
+
+    A failing task cancels its siblings, and the structured error handlers
+    (429, 504, ...) still see the original exception.
+    """
+    try:
+        async with asyncio.TaskGroup() as group:
+            yield group
+    except BaseExceptionGroup as exc:  # pylint: disable=broad-exception-caught
+        raise exc.exceptions[0] from exc
+
+# --------------------------------------------------------------------------- #
+# Customer resolution by email (shared by the customer and case-by-email tools)
+# --------------------------------------------------------------------------- #
+_MAX_CUSTOMER_RESOLUTIONS = 1024
+_customer_resolutions: dict[str, tuple[float, Any]] = {}
+
+async def _resolve_customers(email: str) -> Any:
+    """Return the customers matching `email`, reusing a recent resolution.
+
+    Results are cached for `CUSTOMER_RESOLUTION_TTL` seconds so that a
+    customer lookup followed by a case lookup for the same email costs one
+    upstream customer search. Last-known-good fallback responses are not
+    cached, so the next lookup tries the upstream again and a cache hit is
+    never served without its stale marker.
+    """
+    key = email.strip().lower()
+    now = time.monotonic()
+    cached = _customer_resolutions.get(key)
+    if cached and now - cached[0] < config.CUSTOMER_RESOLUTION_TTL:
+        return cached[1]
+    with track_fallbacks() as fallback:
+        customers = await _upstream("get_customers_by_email", email)
+    if config.CUSTOMER_RESOLUTION_TTL > 0 and not fallback.stale:
+        if len(_customer_resolutions) >= _MAX_CUSTOMER_RESOLUTIONS:
+            _customer_resolutions.pop(next(iter(_customer_resolutions)))
+        _customer_resolutions[key] = (now, customers)
+    return customers
+
+def _customer_id(customer: Any) -> Any:
+    """Return the CustomerID of a customer record, or ``None`` if it has none."""
+    data = _to_dict(customer)
+    for key in ("CustomerID", "customer_id", "id"):
+        if data.get(key) is not None:
+            return data[key]
+    return None
+
+async def _customer_ids_for_email(email: str) -> list[Any] | None:
+    """Return the distinct CustomerIDs matching `email`.
+
+    Returns ``None`` if a matching customer has no recognisable ID, in which
+    case callers fall back to the client's own email-based lookup.
+    """
+    ids = [_customer_id(customer) for customer in await _resolve_customers(email) or []]
+    if None in ids:
+        return None
+    return list(dict.fromkeys(ids))
+
 # --- Inserted get_customers_by_email tool ---
-@mcp.tool()
-async def get_customers_by_email(email: str) -> list[dict[str, Any]] | str:
+@_mcp_tool
+@slow_calls.capture
+async def get_customers_by_email(email: str) -> list[dict[str, Any]] | dict[str, Any] | str:
     """Retrieve Aquarium customers by their email address.
 
     Args:
         email (str): Email address to search for.
 
     Returns:
-        list[dict[str, Any]] | str: A list of customer dictionaries if found, otherwise a message string.
+        list[dict[str, Any]] | dict[str, Any] | str: A list of customer dictionaries if found
+        (or a preview plus resource URI if the result was too large), otherwise a message string.
     """
-    customers = aquarium_client.get_customers_by_email(email)
+    customers = await _resolve_customers(email)
 
     if not customers:
         return f"No customers found for email: {email}"
     logger.debug("Retrieved customers for %s: %s", email, customers)
-    return [_to_dict(cust) for cust in customers]
+    return await _render("get_customers_by_email", customers)
 
 
 # --------------------------------------------------------------------------- #
 # Cases by Lead ID
 # --------------------------------------------------------------------------- #
-@mcp.tool()
-async def get_cases_by_lead_id(lead_id: int) -> list[dict[str, Any]] | str:
+@_mcp_tool
+@slow_calls.capture
+async def get_cases_by_lead_id(lead_id: int) -> list[dict[str, Any]] | dict[str, Any] | str:
     """Return all cases for the given LeadID."""
-    cases = aquarium_client.get_cases_by_lead_id(lead_id)
+    cases = await _upstream("get_cases_by_lead_id", lead_id)
     if not cases:
         return f"No cases found for lead_id: {lead_id}"
     logger.debug("Retrieved %s cases for lead_id=%s", len(cases), lead_id)
-    return [_to_dict(case) for case in cases]
+    return await _render("get_cases_by_lead_id", cases)
 
-@mcp.tool()
+@_mcp_tool
+@slow_calls.capture
 async def get_first_case_by_lead_id(lead_id: int) -> dict[str, Any] | str:
     """Return the first case (if any) for the given LeadID."""
-    case_obj = aquarium_client.get_first_case_by_lead_id(lead_id)
+    case_obj = await _upstream("get_first_case_by_lead_id", lead_id)
     if not case_obj:
         return f"No cases found for lead_id: {lead_id}"
     logger.debug("Retrieved first case for lead_id=%s: %s", lead_id, case_obj)
     return _to_dict(case_obj)
 
-@mcp.tool()
+@_mcp_tool
+@slow_calls.capture
 async def get_first_case_id_by_lead_id(lead_id: str) -> str:
     """Return the first CaseID for the given LeadID."""
-    case_id = aquarium_client.get_first_case_id_by_lead_id(lead_id)
+    case_id = await _upstream("get_first_case_id_by_lead_id", lead_id)
     return case_id or f"No CaseID found for lead_id: {lead_id}"
 
 # --------------------------------------------------------------------------- #
 # Leads / Cases / Matters by Customer ID
 # --------------------------------------------------------------------------- #
-@mcp.tool()
+@_mcp_tool
+@slow_calls.capture
 async def get_leads_cases_matters_ids_by_customer_id(
-        customer_id: str) -> list[dict[str, int]] | str:
+        customer_id: str) -> list[dict[str, int]] | dict[str, Any] | str:
     """Return a list of lead/case/matter ID mappings for the customer."""
-    ids = aquarium_client.get_leads_cases_matters_ids_by_customer_id(customer_id)
+    ids = await _upstream("get_leads_cases_matters_ids_by_customer_id", customer_id)
     if not ids:
         return f"No leads/cases/matters found for customer_id: {customer_id}"
     logger.debug("Retrieved %s id rows for customer_id=%s", len(ids), customer_id)
-    return ids
+    return await _render("get_leads_cases_matters_ids_by_customer_id", ids, convert=dict)
 
 # --------------------------------------------------------------------------- #
 # Cases by Customer ID
 # --------------------------------------------------------------------------- #
-@mcp.tool()
-async def get_cases_by_customer_id(customer_id: str) -> list[dict[str, Any]] | str:
+@_mcp_tool
+@slow_calls.capture
+async def get_cases_by_customer_id(customer_id: str) -> list[dict[str, Any]] | dict[str, Any] | str:
     """Return all cases for the specified CustomerID."""
-    cases = aquarium_client.get_cases_by_customer_id(customer_id)
+    cases = await _upstream("get_cases_by_customer_id", customer_id)
     if not cases:
         return f"No cases found for customer_id: {customer_id}"
     logger.debug("Retrieved %s cases for customer_id=%s", len(cases), customer_id)
-    return [_to_dict(case) for case in cases]
+    return await _render("get_cases_by_customer_id", cases)
 
-@mcp.tool()
+@_mcp_tool
+@slow_calls.capture
 async def get_first_case_by_customer_id(customer_id: str) -> dict[str, Any] | str:
     """Return the first case (if any) for the specified CustomerID."""
-    case_obj = aquarium_client.get_first_case_by_customer_id(customer_id)
+    case_obj = await _upstream("get_first_case_by_customer_id", customer_id)
     if not case_obj:
         return f"No cases found for customer_id: {customer_id}"
     logger.debug("Retrieved first case for customer_id=%s: %s",
@@ -117,19 +491,55 @@ async def get_first_case_by_customer_id(customer_id: str) -> dict[str, Any] | st
 # --------------------------------------------------------------------------- #
 # Cases by Email
 # --------------------------------------------------------------------------- #
-@mcp.tool()
-async def get_cases_by_email(email: str) -> list[dict[str, Any]] | str:
-    """Return all cases associated with the given email."""
-    cases = aquarium_client.get_cases_by_email(email)
+@_mcp_tool
+@slow_calls.capture
+async def get_cases_by_email(email: str) -> list[dict[str, Any]] | dict[str, Any] | str:
+    """Return all cases associated with the given email.
+
+    Customers are resolved once and their cases fetched concurrently; if
+    one lookup fails, the others are cancelled.
+    """
+    customer_ids = await _customer_ids_for_email(email)
+    if customer_ids is None:
+        cases = await _upstream("get_cases_by_email", email)
+    else:
+        async with _task_group() as group:
+            lookups = [
+                group.create_task(_upstream("get_cases_by_customer_id", customer_id))
+                for customer_id in customer_ids
+            ]
+        cases = [case for lookup in lookups for case in lookup.result() or []]
     if not cases:
         return f"No cases found for email: {email}"
     logger.debug("Retrieved %s cases for email=%s", len(cases), email)
-    return [_to_dict(case) for case in cases]
+    return await _render("get_cases_by_email", cases)
 
-@mcp.tool()
+@_mcp_tool
+@slow_calls.capture
 async def get_first_case_by_email(email: str) -> dict[str, Any] | str:
-    """Return the first case (if any) associated with the given email."""
-    case_obj = aquarium_client.get_first_case_by_email(email)
+    """Return the first case (if any) associated with the given email.
+
+    With several matching customers, their first cases are fetched
+    concurrently but the result follows customer order: the case of the
+    earliest customer that has one is returned as soon as every earlier
+    customer has answered, and the remaining lookups are cancelled.
+    """
+    customer_ids = await _customer_ids_for_email(email)
+    if customer_ids is None:
+        case_obj = await _upstream("get_first_case_by_email", email)
+    else:
+        case_obj = None
+        async with _task_group() as group:
+            lookups = [
+                group.create_task(_upstream("get_first_case_by_customer_id", customer_id))
+                for customer_id in customer_ids
+            ]
+            for lookup in lookups:
+                case_obj = await lookup
+                if case_obj:
+                    for later in lookups:
+                        later.cancel()
+                    break
     if not case_obj:
         return f"No cases found for email: {email}"
     logger.debug("Retrieved first case for email=%s: %s", email, case_obj)
@@ -138,28 +548,31 @@ async def get_first_case_by_email(email: str) -> dict[str, Any] | str:
 # --------------------------------------------------------------------------- #
 # Case Status by Matter ID
 # --------------------------------------------------------------------------- #
-@mcp.tool()
+@_mcp_tool
+@slow_calls.capture
 async def get_case_status_by_matter_id(matter_id: int) -> str:
     """Return the StatusName for the specified MatterID."""
-    status = aquarium_client.get_case_status_by_matter_id(matter_id)
+    status = await _upstream("get_case_status_by_matter_id", matter_id)
     return status or f"No status found for matter_id: {matter_id}"
 
 # --------------------------------------------------------------------------- #
 # First Matter ID by Lead ID
 # --------------------------------------------------------------------------- #
-@mcp.tool()
+@_mcp_tool
+@slow_calls.capture
 async def get_first_matter_id_by_lead_id(lead_id: str) -> str:
     """Return the first MatterID (if any) for the given LeadID."""
-    matter_id = aquarium_client.get_first_matter_id_by_lead_id(lead_id)
+    matter_id = await _upstream("get_first_matter_id_by_lead_id", lead_id)
     return matter_id or f"No matter_id found for lead_id: {lead_id}"
 
 # --------------------------------------------------------------------------- #
 # Customer by Customer ID
 # --------------------------------------------------------------------------- #
-@mcp.tool()
+@_mcp_tool
+@slow_calls.capture
 async def get_customer_by_customer_id(customer_id: int) -> dict[str, Any] | str:
     """Return the customer corresponding to the given CustomerID."""
-    customer_obj = aquarium_client.get_customer_by_customer_id(customer_id)
+    customer_obj = await _upstream("get_customer_by_customer_id", customer_id)
     if not customer_obj:
         return f"No customer found for customer_id: {customer_id}"
     logger.debug("Retrieved customer for customer_id=%s: %s",
@@ -169,27 +582,30 @@ async def get_customer_by_customer_id(customer_id: int) -> dict[str, Any] | str:
 # --------------------------------------------------------------------------- #
 # Event History by Case ID
 # --------------------------------------------------------------------------- #
-@mcp.tool()
-async def get_event_history(case_id: int) -> list[dict[str, Any]] | str:
+@_mcp_tool
+@slow_calls.capture
+async def get_event_history(case_id: int) -> list[dict[str, Any]] | dict[str, Any] | str:
     """Return the event history for the specified CaseID."""
-    events = aquarium_client.get_event_history(case_id)
+    events = await _upstream("get_event_history", case_id)
     if not events:
         return f"No event history found for case_id: {case_id}"
     logger.debug("Retrieved %s events for case_id=%s", len(events), case_id)
-    return [_to_dict(event) for event in events]
+    return await _render("get_event_history", events)
 
 # --------------------------------------------------------------------------- #
 # Detail Field Values
 # --------------------------------------------------------------------------- #
-@mcp.tool()
+@_mcp_tool
+@slow_calls.capture
 async def get_detail_values_by_field_ids(
     field_ids: list[int],
     case_id: int | None = None,
     lead_id: int | None = None,
     matter_id: int | None = None,
-) -> list[dict[str, Any]] | str:
+) -> list[dict[str, Any]] | dict[str, Any] | str:
     """Return DetailField values for the provided field IDs and context."""
-    details = aquarium_client.get_detail_values_by_field_ids(
+    details = await _upstream(
+        "get_detail_values_by_field_ids",
         field_ids=field_ids,
         case_id=case_id,
         lead_id=lead_id,
@@ -201,18 +617,12 @@ async def get_detail_values_by_field_ids(
         "Retrieved %s detail fields for field_ids=%s (case_id=%s, lead_id=%s, matter_id=%s)",
         len(details), field_ids, case_id, lead_id, matter_id,
     )
-    return [_to_dict(detail) for detail in details]
+    return await _render("get_detail_values_by_field_ids", details)
 
 # --------------------------------------------------------------------------- #
 # HTTP wrappers for Aquarium MCP tools
 # --------------------------------------------------------------------------- #
 
-async def _maybe_await(result):
-    """Await the result if it's awaitable, otherwise return it directly."""
-    if inspect.isawaitable(result):
-        return await result
-    return result
-
 @router.get(
     "/customers",
     operation_id="get_customers_by_email",
@@ -349,6 +759,174 @@ async def detail_values_route(
         matter_id=matter_id,
     )
 
+# --------------------------------------------------------------------------- #
+# Change feed: pushed case status and event history updates
+# --------------------------------------------------------------------------- #
+MATTER_STATUS = "matter_status"
+CASE_EVENTS = "case_events"
+_MAX_WATCH_TOPICS = 100
+_CHANGE_FEED_CLIENT = ClientIdentity("change-feed", INTERACTIVE, rate_limited=False)
+_RESOURCE_URI = re.compile(r"^aquarium://(?:matters/(\d+)/status|cases/(\d+)/events)$")
+
+async def _fetch_matter_status(matter_id: int) -> str | None:
+    """Return the current StatusName of a matter."""
+    return await _upstream("get_case_status_by_matter_id", matter_id)
+
+async def _fetch_case_events(case_id: int) -> list[dict[str, Any]]:
+    """Return the current event history of a case as plain dicts."""
+    events = await _upstream("get_event_history", case_id)
+    return [_to_dict(event) for event in events or []]
+
+def _as_change_feed(fetch):
+    """Run `fetch` as the (unthrottled) change-feed watcher rather than the subscriber."""
+    async def fetch_as_change_feed(ident: int) -> Any:
+        current_client.set(_CHANGE_FEED_CLIENT)
+        return await fetch(ident)
+    return fetch_as_change_feed
+
+_TOPIC_FETCHERS = {MATTER_STATUS: _fetch_matter_status, CASE_EVENTS: _fetch_case_events}
+
+change_feed = ChangeFeed(
+    {kind: _as_change_feed(fetch) for kind, fetch in _TOPIC_FETCHERS.items()},
+    interval=config.CHANGE_FEED_INTERVAL,
+)
+
+def _topic_for_uri(uri: Any) -> Topic | None:
+    """Map a subscribable resource URI to its change feed topic."""
+    match = _RESOURCE_URI.match(str(uri))
+    if not match:
+        return None
+    matter_id, case_id = match.groups()
+    return (MATTER_STATUS, int(matter_id)) if matter_id else (CASE_EVENTS, int(case_id))
+
+async def _read_topic(topic: Topic) -> Any:
+    """Return the change feed's snapshot of `topic`, fetching it only if there is none.
+
+    Only reads that go upstream are charged against the caller's rate limit.
+    """
+    try:
+        return change_feed.snapshot(topic)
+    except KeyError:
+        _charge_rate_limit(topic[0])
+        return await _TOPIC_FETCHERS[topic[0]](topic[1])
+
+@mcp.resource("aquarium://matters/{matter_id}/status")
+async def matter_status_resource(matter_id: str) -> str:
+    """Current StatusName of a matter. Subscribe to be notified when it changes."""
+    status = await _read_topic((MATTER_STATUS, int(matter_id)))
+    return json.dumps({"matter_id": int(matter_id), "status": status})
+
+@mcp.resource("aquarium://cases/{case_id}/events")
+async def case_events_resource(case_id: str) -> str:
+    """Event history of a case. Subscribe to be notified when events are added."""
+    events = await _read_topic((CASE_EVENTS, int(case_id)))
+    return json.dumps({"case_id": int(case_id), "events": events}, default=str)
+
+@mcp._mcp_server.subscribe_resource()  # pylint: disable=protected-access
+async def subscribe_resource(uri: Any) -> None:
+    """Notify the requesting MCP session whenever the resource at `uri` changes.
+
+    Subscriptions are keyed by the session's client key so they can be
+    released when the session disconnects (see `release_session_subscriptions`).
+    """
+    topic = _topic_for_uri(uri)
+    if topic is None:
+        raise ValueError(f"Resource does not support subscriptions: {uri}")
+    session = mcp._mcp_server.request_context.session  # pylint: disable=protected-access
+
+    async def notify(_change: dict[str, Any]) -> None:
+        await session.send_resource_updated(uri)
+
+    await change_feed.subscribe(topic, (current_client.get().key, str(uri)), notify)
+
+@mcp._mcp_server.unsubscribe_resource()  # pylint: disable=protected-access
+async def unsubscribe_resource(uri: Any) -> None:
+    """Stop notifying the requesting MCP session about `uri`."""
+    topic = _topic_for_uri(uri)
+    if topic is not None:
+        change_feed.unsubscribe(topic, (current_client.get().key, str(uri)))
+
+def release_session_subscriptions(client_key: str) -> None:
+    """Drop every resource subscription held by the MCP session `client_key`."""
+    removed = change_feed.unsubscribe_matching(lambda key: key[0] == client_key)
+    if removed:
+        logger.info("Released %d resource subscription(s) of %s", removed, client_key)
+
+@router.get(
+    "/watch",
+    operation_id="watch_changes",
+    summary="Stream case status and event history changes as Server-Sent Events",
+)
+async def watch_route(
+    matter_id: list[int] = Query([], description="MatterIDs whose status to watch"),
+    case_id: list[int] = Query([], description="CaseIDs whose event history to watch"),
+):
+    """Stream `change` events for the given matters and cases.
+
+    Each subscriber first receives a snapshot per topic, then only the
+    differences detected by the shared change feed watcher.
+    """
+    topics = [(MATTER_STATUS, ident) for ident in matter_id]
+    topics += [(CASE_EVENTS, ident) for ident in case_id]
+    if not topics:
+        raise HTTPException(status_code=400, detail="Provide at least one matter_id or case_id.")
+    if len(topics) > _MAX_WATCH_TOPICS:
+        raise HTTPException(
+            status_code=400, detail=f"At most {_MAX_WATCH_TOPICS} topics can be watched."
+        )
+
+    async def stream():
+        async with Subscription(change_feed, topics) as subscription:
+            while True:
+                change = await subscription.get(timeout=15)
+                if change is None:
+                    yield ": keep-alive\n\n"
+                else:
+                    yield f"event: change\ndata: {json.dumps(change, default=str)}\n\n"
+
+    return StreamingResponse(stream(), media_type="text/event-stream")
+
+# --------------------------------------------------------------------------- #
+# Spilled (oversized) results
+# --------------------------------------------------------------------------- #
+async def _spilled_page(result_id: str, start: int) -> str:
+    """Return one page of a spilled result as JSON, with the URI of the next page."""
+    spilled = spill_store.get(result_id)
+    if spilled is None:
+        raise ValueError(f"Unknown or expired result: {result_id}")
+    with spill_store.reservation():
+        page = await asyncio.to_thread(spill_store.read_page, spilled, start)
+        if page["next_start"] is not None:
+            page["next_uri"] = f"aquarium://results/{result_id}/from/{page['next_start']}"
+        return json.dumps(page, default=str)
+
+@mcp.resource("aquarium://results/{result_id}")
+async def spilled_result_resource(result_id: str) -> str:
+    """First page of a tool result that was too large to return inline.
+
+    Pages are bounded by the per-request memory budget; follow ``next_uri``
+    for the rest, or download the whole payload from the ``url`` given with
+    the preview.
+    """
+    return await _spilled_page(result_id, 0)
+
+@mcp.resource("aquarium://results/{result_id}/from/{start}")
+async def spilled_result_page_resource(result_id: str, start: str) -> str:
+    """Page of a spilled tool result starting at item index `start`."""
+    return await _spilled_page(result_id, int(start))
+
+@router.get(
+    "/results/{result_id}",
+    operation_id="get_spilled_result",
+    summary="Download the full payload of a tool result that was too large to return inline",
+)
+async def spilled_result_route(result_id: str):
+    """Stream the spilled JSON payload from disk."""
+    spilled = spill_store.get(result_id)
+    if spilled is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired result.")
+    return FileResponse(spilled.path, media_type="application/json")
+
 
 if __name__ == "__main__":
     # Initialize and run the server
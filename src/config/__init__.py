@@ -4,15 +4,13 @@
 Configuration Module
 
 This module initializes the application's configuration settings based on the environment.
+The `.env` file is loaded once by `src.config.settings`.
 It utilizes environment variables to determine whether to load development or production settings.
 """
 
 import os
-from dotenv import load_dotenv
 from src.config.settings import DevelopmentConfig, ProductionConfig, Config
 
-load_dotenv()
-
 
 def get_config() -> Config:
     """
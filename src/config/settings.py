@@ -21,6 +21,55 @@ class Config:
     DEBUG: bool = False  # pylint: disable=invalid-name
     APP_ENV = os.getenv("APP_ENV")
     GROK_URL: str = os.getenv("GROK_URL", "https://127c-156-253-249-23.ngrok-free.app")  # pylint: disable=invalid-name
+    AQUARIUM_WSDL_URL: str = os.getenv("AQUARIUM_WSDL_URL", "")  # pylint: disable=invalid-name
+    AQUARIUM_SCHEMA_CACHE_DIR: str = os.getenv(  # pylint: disable=invalid-name
+        "AQUARIUM_SCHEMA_CACHE_DIR", "tmp/cache/aquarium"
+    )
+    AQUARIUM_CLIENT_MODE: str = os.getenv("AQUARIUM_CLIENT_MODE", "async").lower()  # pylint: disable=invalid-name
+    AQUARIUM_MAX_WORKERS: int = int(os.getenv("AQUARIUM_MAX_WORKERS", "16"))  # pylint: disable=invalid-name
+    AQUARIUM_TIMEOUT: float = float(os.getenv("AQUARIUM_TIMEOUT", "30"))  # pylint: disable=invalid-name
+    CUSTOMER_RESOLUTION_TTL: float = float(os.getenv("CUSTOMER_RESOLUTION_TTL", "60"))  # pylint: disable=invalid-name
+    AQUARIUM_REPLAY_MODE: str = os.getenv("AQUARIUM_REPLAY_MODE", "off").lower()  # pylint: disable=invalid-name
+    AQUARIUM_REPLAY_PATH: str = os.getenv(  # pylint: disable=invalid-name
+        "AQUARIUM_REPLAY_PATH", "tmp/replay/aquarium.sqlite3"
+    )
+    AQUARIUM_REPLAY_LATENCY_SCALE: float = float(  # pylint: disable=invalid-name
+        os.getenv("AQUARIUM_REPLAY_LATENCY_SCALE", "0")
+    )
+    AQUARIUM_REPLAY_MAX_AGE: float = float(  # pylint: disable=invalid-name
+        os.getenv("AQUARIUM_REPLAY_MAX_AGE", str(7 * 24 * 3600))
+    )
+    AQUARIUM_REPLAY_MAX_ROWS: int = int(os.getenv("AQUARIUM_REPLAY_MAX_ROWS", "100000"))  # pylint: disable=invalid-name
+    AQUARIUM_FALLBACK_REFRESH: float = float(  # pylint: disable=invalid-name
+        os.getenv("AQUARIUM_FALLBACK_REFRESH", "300")
+    )
+    RATE_LIMIT_PER_SECOND: float = float(os.getenv("RATE_LIMIT_PER_SECOND", "5"))  # pylint: disable=invalid-name
+    RATE_LIMIT_BURST: float = float(os.getenv("RATE_LIMIT_BURST", "20"))  # pylint: disable=invalid-name
+    RATE_LIMIT_TOOL_RATES: str = os.getenv("RATE_LIMIT_TOOL_RATES", "")  # pylint: disable=invalid-name
+    UPSTREAM_MAX_CONCURRENCY: int = int(os.getenv("UPSTREAM_MAX_CONCURRENCY", "8"))  # pylint: disable=invalid-name
+    API_KEYS: str = os.getenv("API_KEYS", "")  # pylint: disable=invalid-name
+    BATCH_API_KEYS: str = os.getenv("BATCH_API_KEYS", "")  # pylint: disable=invalid-name
+    TRUSTED_PROXIES: str = os.getenv("TRUSTED_PROXIES", "")  # pylint: disable=invalid-name
+    CHANGE_FEED_INTERVAL: float = float(os.getenv("CHANGE_FEED_INTERVAL", "15"))  # pylint: disable=invalid-name
+    COMPRESSION_MINIMUM_SIZE: int = int(os.getenv("COMPRESSION_MINIMUM_SIZE", "1024"))  # pylint: disable=invalid-name
+    RESULT_SPILL_DIR: str = os.getenv("RESULT_SPILL_DIR", "tmp/spill")  # pylint: disable=invalid-name
+    RESULT_REQUEST_BUDGET: int = int(  # pylint: disable=invalid-name
+        os.getenv("RESULT_REQUEST_BUDGET", str(2 * 1024 * 1024))
+    )
+    RESULT_GLOBAL_BUDGET: int = int(  # pylint: disable=invalid-name
+        os.getenv("RESULT_GLOBAL_BUDGET", str(64 * 1024 * 1024))
+    )
+    RESULT_PREVIEW_ITEMS: int = int(os.getenv("RESULT_PREVIEW_ITEMS", "20"))  # pylint: disable=invalid-name
+    RESULT_SPILL_TTL: float = float(os.getenv("RESULT_SPILL_TTL", "900"))  # pylint: disable=invalid-name
+    ADMIN_TOKEN: str = os.getenv("ADMIN_TOKEN", "")  # pylint: disable=invalid-name
+    SLOW_CALL_THRESHOLD: float = float(os.getenv("SLOW_CALL_THRESHOLD", "2"))  # pylint: disable=invalid-name
+    SLOW_CALL_BUFFER_SIZE: int = int(os.getenv("SLOW_CALL_BUFFER_SIZE", "100"))  # pylint: disable=invalid-name
+    PROFILER_MAX_SECONDS: float = float(os.getenv("PROFILER_MAX_SECONDS", "300"))  # pylint: disable=invalid-name
+    COMPACT_TOOL_RESULTS: bool = (  # pylint: disable=invalid-name
+        os.getenv("COMPACT_TOOL_RESULTS", "false").lower() == "true"
+    )
+    AQUARIUM_WARMUP: bool = os.getenv("AQUARIUM_WARMUP", "false").lower() == "true"  # pylint: disable=invalid-name
+    COMPACT_MAX_ITEMS: int = int(os.getenv("COMPACT_MAX_ITEMS", "50"))  # pylint: disable=invalid-name
 
 @dataclass
 class DevelopmentConfig(Config):
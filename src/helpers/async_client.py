@@ -0,0 +1,196 @@
+# src/helpers/async_client.py
+
+"""
+Async Aquarium client adapter.
+
+`AquariumClient` (from the `crm-aq` package) is synchronous and owns its
+SOAP transport, so calling it from the async MCP tools blocks the event loop
+for the whole round trip. `AsyncAquariumClient` exposes the same method
+surface as coroutines: each call runs on a bounded, shared worker pool with a
+per-request timeout, and the wrapped client's HTTP session (when it exposes a
+`requests` session) is given a keep-alive connection pool sized to match.
+
+A worker thread can't be interrupted, so a timed-out call keeps its worker
+slot until the thread returns; the same timeout is set on the HTTP transport
+so that happens promptly instead of threads piling up behind a slow upstream.
+"""
+
+import asyncio
+import functools
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator
+import anyio
+from src.helpers.logger import get_logger
+
+try:
+    from requests.adapters import HTTPAdapter  # pylint: disable=import-error
+    from requests.exceptions import Timeout as TransportTimeout  # pylint: disable=import-error
+except ImportError:  # requests is only present when crm-aq uses it
+    HTTPAdapter = None
+    TransportTimeout = None
+
+logger = get_logger(__name__)
+
+# Public AquariumClient methods used by the MCP tools.
+AQUARIUM_METHODS = (
+    "get_customers_by_email",
+    "get_customer_by_customer_id",
+    "get_cases_by_lead_id",
+    "get_first_case_by_lead_id",
+    "get_first_case_id_by_lead_id",
+    "get_leads_cases_matters_ids_by_customer_id",
+    "get_cases_by_customer_id",
+    "get_first_case_by_customer_id",
+    "get_cases_by_email",
+    "get_first_case_by_email",
+    "get_case_status_by_matter_id",
+    "get_first_matter_id_by_lead_id",
+    "get_event_history",
+    "get_detail_values_by_field_ids",
+)
+
+
+class UpstreamTimeout(TimeoutError):
+    """Raised when an Aquarium call exceeds the per-request timeout.
+
+    Attributes:
+        pending: The still-running worker call, if the caller stopped waiting
+            before it finished; it completes once the thread returns.
+    """
+
+    def __init__(self, method: str, timeout: float, pending: asyncio.Future | None = None) -> None:
+        self.method = method
+        self.timeout = timeout
+        self.pending = pending
+        super().__init__(f"Aquarium call {method} timed out after {timeout:g}s")
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the structured error payload."""
+        return {"error": "upstream_timeout", "tool": self.method, "timeout": self.timeout}
+
+
+_detached: ContextVar[list[asyncio.Future] | None] = ContextVar("detached_calls", default=None)
+
+
+@contextmanager
+def track_detached() -> Iterator[list[asyncio.Future]]:
+    """Collect the still-running worker calls whose timeouts were handled inside the block.
+
+    Tasks started inside the block share the list, so a caller can keep
+    resources tied to the upstream work until those calls have finished.
+    """
+    pending: list[asyncio.Future] = []
+    token = _detached.set(pending)
+    try:
+        yield pending
+    finally:
+        _detached.reset(token)
+
+
+def detach(exc: BaseException) -> None:
+    """Report the pending worker call of a handled `UpstreamTimeout` to `track_detached()`.
+
+    Call this when swallowing the timeout instead of letting it propagate.
+    """
+    pending = _detached.get()
+    if isinstance(exc, UpstreamTimeout) and exc.pending is not None and pending is not None:
+        pending.append(exc.pending)
+
+
+if HTTPAdapter is not None:
+    class TimeoutHTTPAdapter(HTTPAdapter):
+        """`HTTPAdapter` that applies a default timeout to requests sent without one."""
+
+        def __init__(self, *args: Any, timeout: float | None = None, **kwargs: Any) -> None:
+            self.timeout = timeout
+            super().__init__(*args, **kwargs)
+
+        def send(self, request, **kwargs):  # pylint: disable=arguments-differ
+            if kwargs.get("timeout") is None:
+                kwargs["timeout"] = self.timeout
+            return super().send(request, **kwargs)
+
+
+def configure_connection_pool(client: Any, pool_size: int, timeout: float | None = None) -> bool:
+    """Give the client's `requests` session a keep-alive pool of `pool_size` connections.
+
+    Looks for the session on the client itself and on a zeep-style transport.
+    Requests sent without an explicit timeout get `timeout` (``None`` disables it).
+
+    Returns:
+        bool: Whether a session was found and configured.
+    """
+    if HTTPAdapter is None:
+        return False
+    transport = getattr(client, "transport", None)
+    for owner in (client, transport):
+        for attribute in ("session", "_session"):
+            session = getattr(owner, attribute, None)
+            if session is not None and hasattr(session, "mount"):
+                adapter = TimeoutHTTPAdapter(
+                    pool_connections=pool_size, pool_maxsize=pool_size, timeout=timeout
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                return True
+    return False
+
+
+class AsyncAquariumClient:
+    """Coroutine facade over a synchronous `AquariumClient`.
+
+    Args:
+        client: The synchronous client to delegate to.
+        max_workers: Maximum number of concurrent upstream calls (worker threads).
+        timeout: Per-request timeout in seconds; ``0`` disables it.
+    """
+
+    def __init__(self, client: Any, max_workers: int = 16, timeout: float = 30.0) -> None:
+        self.client = client
+        self.timeout = timeout
+        self._limiter = anyio.CapacityLimiter(max(max_workers, 1))
+        if configure_connection_pool(client, max_workers, timeout or None):
+            logger.info("Configured Aquarium HTTP pool with %s connections", max_workers)
+
+    async def call(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        """Run `client.<method>(*args, **kwargs)` on the worker pool.
+
+        The worker slot is held until the thread returns, even if the caller
+        times out or is cancelled first.
+
+        Raises:
+            UpstreamTimeout: If the call does not complete within the timeout.
+        """
+        func = functools.partial(getattr(self.client, method), *args, **kwargs)
+        work = asyncio.ensure_future(anyio.to_thread.run_sync(func, limiter=self._limiter))
+        work.add_done_callback(_consume_result)
+        try:
+            if not self.timeout:
+                return await asyncio.shield(work)
+            return await asyncio.wait_for(asyncio.shield(work), self.timeout)
+        except asyncio.TimeoutError as exc:
+            raise UpstreamTimeout(method, self.timeout, pending=work) from exc
+        except Exception as exc:
+            if TransportTimeout is not None and isinstance(exc, TransportTimeout):
+                raise UpstreamTimeout(method, self.timeout) from exc
+            raise
+
+
+def _consume_result(work: asyncio.Future) -> None:
+    """Retrieve the outcome of a worker call nobody may be waiting on any more."""
+    if not work.cancelled() and work.exception() is not None:
+        logger.debug("Aquarium worker call failed: %s", work.exception())
+
+
+def _make_method(name: str):
+    async def method(self: AsyncAquariumClient, *args: Any, **kwargs: Any) -> Any:
+        return await self.call(name, *args, **kwargs)
+    method.__name__ = name
+    method.__qualname__ = f"AsyncAquariumClient.{name}"
+    method.__doc__ = f"Async counterpart of `AquariumClient.{name}`."
+    return method
+
+
+for _name in AQUARIUM_METHODS:
+    setattr(AsyncAquariumClient, _name, _make_method(_name))
@@ -0,0 +1,194 @@
+# src/helpers/change_feed.py
+
+"""
+Change feed module.
+
+Instead of every agent or dashboard polling Aquarium for case status and
+event history, subscribers register interest in topics (for example a
+MatterID's status) with a shared `ChangeFeed`. A single background watcher
+polls each subscribed topic once per interval, diffs the result against the
+previous snapshot and pushes only the changes to every subscriber, so N
+subscribers of a topic cost one upstream call per interval.
+"""
+
+import asyncio
+import json
+from typing import Any, Awaitable, Callable, Hashable
+from src.helpers.logger import get_logger
+
+logger = get_logger(__name__)
+
+Topic = tuple[str, int]
+Fetcher = Callable[[int], Awaitable[Any]]
+Callback = Callable[[dict[str, Any]], Awaitable[None]]
+
+
+def _canonical(value: Any) -> str:
+    """Return a stable JSON encoding used to compare snapshots."""
+    return json.dumps(value, sort_keys=True, default=str)
+
+
+def diff_snapshots(previous: Any, current: Any) -> dict[str, Any] | None:
+    """Describe how `current` differs from `previous`, or ``None`` if unchanged.
+
+    Lists are diffed item by item (``added``/``removed``); any other value is
+    reported whole alongside the previous one.
+    """
+    if _canonical(previous) == _canonical(current):
+        return None
+    if isinstance(previous, list) and isinstance(current, list):
+        before = {_canonical(item) for item in previous}
+        after = {_canonical(item) for item in current}
+        return {
+            "type": "update",
+            "added": [item for item in current if _canonical(item) not in before],
+            "removed": [item for item in previous if _canonical(item) not in after],
+        }
+    return {"type": "update", "value": current, "previous": previous}
+
+
+class Subscription:
+    """Queue-backed subscription, iterated by streaming endpoints.
+
+    If the consumer falls behind, the oldest undelivered change is dropped.
+    """
+
+    def __init__(self, feed: "ChangeFeed", topics: list[Topic], maxsize: int = 100) -> None:
+        self.feed = feed
+        self.topics = topics
+        self.queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue(maxsize=maxsize)
+
+    async def _deliver(self, change: dict[str, Any]) -> None:
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(change)
+
+    async def __aenter__(self) -> "Subscription":
+        for topic in self.topics:
+            await self.feed.subscribe(topic, self, self._deliver)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        for topic in self.topics:
+            self.feed.unsubscribe(topic, self)
+
+    async def get(self, timeout: float | None = None) -> dict[str, Any] | None:
+        """Return the next change, or ``None`` if none arrives within `timeout`."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class ChangeFeed:
+    """Aggregate poller that fans out per-topic changes to subscribers.
+
+    Args:
+        fetchers: Coroutine per topic kind returning the JSON-ready current value for an ID.
+        interval: Seconds between aggregate polls.
+    """
+
+    def __init__(self, fetchers: dict[str, Fetcher], interval: float) -> None:
+        self.fetchers = fetchers
+        self.interval = interval
+        self._subscribers: dict[Topic, dict[Hashable, Callback]] = {}
+        self._snapshots: dict[Topic, Any] = {}
+        self._task: asyncio.Task | None = None
+
+    @property
+    def topics(self) -> list[Topic]:
+        """Topics that currently have at least one subscriber."""
+        return list(self._subscribers)
+
+    async def subscribe(self, topic: Topic, key: Hashable, callback: Callback) -> None:
+        """Register `callback` under `key` for changes to `topic`.
+
+        The subscriber immediately receives the last snapshot if one exists,
+        and the background watcher is started if it is not running.
+        """
+        if topic[0] not in self.fetchers:
+            raise ValueError(f"Unknown change feed topic: {topic[0]}")
+        self._subscribers.setdefault(topic, {})[key] = callback
+        if topic in self._snapshots:
+            await callback(self._event(topic, {"type": "snapshot", "value": self._snapshots[topic]}))
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def unsubscribe(self, topic: Topic, key: Hashable) -> None:
+        """Remove the subscriber registered under `key` for `topic`."""
+        subscribers = self._subscribers.get(topic)
+        if subscribers is None:
+            return
+        subscribers.pop(key, None)
+        if not subscribers:
+            del self._subscribers[topic]
+            self._snapshots.pop(topic, None)
+
+    def unsubscribe_matching(self, predicate: Callable[[Hashable], bool]) -> int:
+        """Remove every subscriber whose key satisfies `predicate`, on all topics.
+
+        Used to clean up after a client that disconnects without unsubscribing.
+        Returns the number of subscriptions removed.
+        """
+        removed = 0
+        for topic, subscribers in list(self._subscribers.items()):
+            for key in [key for key in subscribers if predicate(key)]:
+                self.unsubscribe(topic, key)
+                removed += 1
+        return removed
+
+    def snapshot(self, topic: Topic) -> Any:
+        """Return the last polled value of `topic`.
+
+        Raises:
+            KeyError: If the topic has no subscribers or hasn't been polled yet.
+        """
+        return self._snapshots[topic]
+
+    @staticmethod
+    def _event(topic: Topic, change: dict[str, Any]) -> dict[str, Any]:
+        return {"topic": topic[0], "id": topic[1], **change}
+
+    async def poll_once(self) -> None:
+        """Poll every subscribed topic once and push changes to its subscribers."""
+        topics = self.topics
+        results = await asyncio.gather(
+            *(self.fetchers[kind](ident) for kind, ident in topics), return_exceptions=True
+        )
+        for topic, current in zip(topics, results):
+            if isinstance(current, BaseException):
+                logger.warning("Change feed poll failed for %s: %s", topic, current)
+                continue
+            if topic not in self._subscribers:
+                continue
+            if topic in self._snapshots:
+                change = diff_snapshots(self._snapshots[topic], current)
+            else:
+                change = {"type": "snapshot", "value": current}
+            self._snapshots[topic] = current
+            if change is not None:
+                await self._notify(topic, self._event(topic, change))
+
+    async def stop(self) -> None:
+        """Cancel the background watcher and wait for it to finish."""
+        task, self._task = self._task, None
+        if task is None or task.done():
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    async def _notify(self, topic: Topic, event: dict[str, Any]) -> None:
+        for key, callback in list(self._subscribers.get(topic, {}).items()):
+            try:
+                await callback(event)
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                logger.info("Dropping change feed subscriber %s: %s", key, exc)
+                self.unsubscribe(topic, key)
+
+    async def _run(self) -> None:
+        while self._subscribers:
+            await self.poll_once()
+            await asyncio.sleep(self.interval)
@@ -0,0 +1,141 @@
+# src/helpers/compaction.py
+
+"""
+Tool-result compaction module.
+
+This module shrinks Aquarium tool results before they are handed to the LLM:
+null/empty values are dropped, fields are narrowed to a per-tool whitelist,
+tabular results are rendered column-wise and long lists are truncated with a
+"more available" marker.
+"""
+
+import json
+import logging
+from typing import Any
+from src.helpers.logger import get_logger
+
+logger = get_logger(__name__)
+
+CUSTOMER_FIELDS = (
+    "CustomerID", "TitleID", "FirstName", "LastName", "FullName",
+    "EmailAddress", "HomeTelephone", "MobileTelephone", "Address1",
+    "Address2", "Town", "County", "PostCode",
+)
+CASE_FIELDS = (
+    "CaseID", "LeadID", "CustomerID", "MatterID", "CaseNum", "CaseRef",
+    "ClientStatusID", "AquariumStatusID", "StatusName", "WhenCreated",
+    "WhenModified", "Matters",
+)
+EVENT_FIELDS = (
+    "LeadEventID", "CaseID", "EventTypeID", "EventTypeName", "WhenCreated",
+    "WhoCreated", "Comments",
+)
+DETAIL_FIELDS = (
+    "DetailFieldID", "FieldName", "DetailValue", "LeadID", "CaseID", "MatterID",
+)
+
+# Fields the agent actually needs, per tool. Whitelists only apply when they
+# match at least one key of a record, so unexpected SDK shapes pass through.
+FIELD_WHITELISTS: dict[str, tuple[str, ...]] = {
+    "get_customers_by_email": CUSTOMER_FIELDS,
+    "get_customer_by_customer_id": CUSTOMER_FIELDS,
+    "get_cases_by_lead_id": CASE_FIELDS,
+    "get_first_case_by_lead_id": CASE_FIELDS,
+    "get_cases_by_customer_id": CASE_FIELDS,
+    "get_first_case_by_customer_id": CASE_FIELDS,
+    "get_cases_by_email": CASE_FIELDS,
+    "get_first_case_by_email": CASE_FIELDS,
+    "get_event_history": EVENT_FIELDS,
+    "get_detail_values_by_field_ids": DETAIL_FIELDS,
+}
+
+# Tools whose list results are rendered as {"columns": [...], "rows": [...]}.
+TABULAR_TOOLS = frozenset({
+    "get_leads_cases_matters_ids_by_customer_id",
+    "get_event_history",
+    "get_detail_values_by_field_ids",
+})
+
+
+def payload_size(value: Any) -> int:
+    """Return the size in bytes of `value` encoded as compact JSON."""
+    return len(json.dumps(value, default=str, separators=(",", ":")).encode("utf-8"))
+
+
+def _prune(value: Any) -> Any:
+    """Recursively drop ``None`` and empty strings, lists and dicts."""
+    if isinstance(value, dict):
+        pruned = {key: _prune(item) for key, item in value.items()}
+        return {key: item for key, item in pruned.items() if item not in (None, "", [], {})}
+    if isinstance(value, (list, tuple)):
+        pruned = [_prune(item) for item in value]
+        return [item for item in pruned if item not in (None, "", [], {})]
+    return value
+
+
+def _whitelist(record: Any, fields: tuple[str, ...]) -> Any:
+    """Narrow a record to `fields`, leaving it untouched if none of them match."""
+    if not isinstance(record, dict):
+        return record
+    kept = {key: record[key] for key in fields if key in record}
+    return kept or record
+
+
+def _columnar(rows: list[dict[str, Any]]) -> dict[str, Any]:
+    """Render a list of dicts as a column header plus value rows."""
+    columns: list[str] = []
+    for row in rows:
+        for key in row:
+            if key not in columns:
+                columns.append(key)
+    return {
+        "columns": columns,
+        "rows": [[row.get(column) for column in columns] for row in rows],
+    }
+
+
+def compact_result(tool: str, result: Any, max_items: int) -> Any:
+    """Compact a tool result for LLM consumption.
+
+    Args:
+        tool (str): Name of the MCP tool that produced the result.
+        result (Any): The plain (already dict-converted) tool result.
+        max_items (int): Maximum number of list items to keep; ``0`` disables truncation.
+
+    Returns:
+        Any: The compacted result. Lists longer than `max_items` carry a
+        ``more_available`` count of the omitted items.
+    """
+    if isinstance(result, str):
+        return result
+
+    report_sizes = logger.isEnabledFor(logging.INFO)
+    before = payload_size(result) if report_sizes else 0
+    fields = FIELD_WHITELISTS.get(tool)
+    is_list = isinstance(result, list)
+    records = result if is_list else [result]
+    if fields:
+        records = [_whitelist(record, fields) for record in records]
+    records = _prune(records)
+
+    more_available = 0
+    if is_list and max_items and len(records) > max_items:
+        more_available = len(records) - max_items
+        records = records[:max_items]
+
+    if not is_list:
+        compacted: Any = records[0] if records else {}
+    elif tool in TABULAR_TOOLS and records and all(isinstance(r, dict) for r in records):
+        compacted = _columnar(records)
+        if more_available:
+            compacted["more_available"] = more_available
+    else:
+        compacted = records
+        if more_available:
+            compacted.append({"more_available": more_available})
+
+    if report_sizes:
+        logger.info(
+            "Compacted %s result: %s -> %s bytes", tool, before, payload_size(compacted)
+        )
+    return compacted
@@ -0,0 +1,78 @@
+# src/helpers/http_cache.py
+
+"""
+HTTP caching module.
+
+This module adds validators and freshness information to the `/aquarium/*`
+REST wrappers: every successful JSON response carries a content-hash `ETag`
+and a per-route `Cache-Control` max-age, and requests whose `If-None-Match`
+matches the current representation get an empty ``304 Not Modified``.
+"""
+
+import hashlib
+from typing import Callable, Coroutine, Any
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+
+# Freshness (max-age, seconds) per operation_id. Identity mappings rarely
+# change; case status and event history are polled for changes.
+CACHE_POLICIES: dict[str, int] = {
+    "get_customers_by_email": 300,
+    "get_customer_by_customer_id": 300,
+    "get_leads_cases_matters_ids_by_customer_id": 300,
+    "get_first_case_id_by_lead_id": 300,
+    "get_first_matter_id_by_lead_id": 300,
+    "get_cases_by_lead_id": 60,
+    "get_first_case_by_lead_id": 60,
+    "get_cases_by_customer_id": 60,
+    "get_first_case_by_customer_id": 60,
+    "get_cases_by_email": 60,
+    "get_first_case_by_email": 60,
+    "get_detail_values_by_field_ids": 30,
+    "get_case_status_by_matter_id": 15,
+    "get_event_history": 15,
+}
+
+# Aquarium payloads contain customer data, so shared caches must not store
+# them unless explicitly allowed.
+CACHE_SCOPE = "private"
+
+
+def make_etag(body: bytes) -> str:
+    """Return a weak ETag for `body` (weak, because compression may re-encode it)."""
+    return 'W/"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Whether an `If-None-Match` header value matches `etag` (weak comparison)."""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    if "*" in candidates:
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.removeprefix("W/") == opaque for tag in candidates)
+
+
+class CachingRoute(APIRoute):
+    """`APIRoute` that applies `CACHE_POLICIES` and conditional GET handling."""
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+        max_age = CACHE_POLICIES.get(self.operation_id or "")
+        if max_age is None:
+            return handler
+
+        async def caching_route_handler(request: Request) -> Response:
+            response = await handler(request)
+            body = getattr(response, "body", None)
+            if request.method not in ("GET", "HEAD") or response.status_code != 200 or body is None:
+                return response
+            etag = make_etag(body)
+            headers = {"ETag": etag, "Cache-Control": f"{CACHE_SCOPE}, max-age={max_age}"}
+            if etag_matches(request.headers.get("if-none-match"), etag):
+                return Response(status_code=304, headers=headers)
+            response.headers.update(headers)
+            return response
+
+        return caching_route_handler
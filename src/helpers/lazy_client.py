@@ -0,0 +1,63 @@
+# src/helpers/lazy_client.py
+
+"""
+Lazy client module.
+
+This module provides a proxy that defers construction of an expensive client
+(such as the SOAP-backed `AquariumClient`) until it is first used, so that
+importing the application does not fetch the WSDL or authenticate.
+"""
+
+import asyncio
+import threading
+import time
+from typing import Any, Callable
+from src.helpers.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class LazyClient:
+    """Build the wrapped client on first use and proxy attribute access to it.
+
+    Construction is guarded by a lock so concurrent first calls build the
+    client only once. Async callers should use `aget()` so the (blocking)
+    construction runs in a worker thread instead of the event loop.
+    """
+
+    def __init__(self, factory: Callable[[], Any], name: str = "client") -> None:
+        self._factory = factory
+        self._name = name
+        self._instance: Any = None
+        self._lock = threading.Lock()
+
+    @property
+    def initialized(self) -> bool:
+        """Whether the wrapped client has already been constructed."""
+        return self._instance is not None
+
+    def get(self) -> Any:
+        """Return the wrapped client, constructing it if needed."""
+        if self._instance is None:
+            with self._lock:
+                if self._instance is None:
+                    started = time.perf_counter()
+                    self._instance = self._factory()
+                    logger.info(
+                        "Initialized %s in %.3fs", self._name, time.perf_counter() - started
+                    )
+        return self._instance
+
+    async def aget(self) -> Any:
+        """Return the wrapped client, constructing it in a worker thread if needed."""
+        if self._instance is None:
+            return await asyncio.to_thread(self.get)
+        return self._instance
+
+    def reset(self) -> None:
+        """Drop the wrapped client so the next use constructs a fresh one."""
+        with self._lock:
+            self._instance = None
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.get(), name)
@@ -0,0 +1,194 @@
+# src/helpers/profiling.py
+
+"""
+Profiling module.
+
+Provides two low-overhead diagnostics for latency spikes:
+
+* `SamplingProfiler`, a background thread that periodically samples the
+  stacks of all other threads and aggregates them in the "folded" format
+  understood by flamegraph.pl, speedscope and similar tools, and
+* `SlowCallLog`, a bounded ring buffer that captures the arguments, phase
+  timings (queueing, upstream wait, conversion, compaction, encoding) and a
+  stack summary of the slowest phase of every tool call slower than a
+  threshold.
+"""
+
+import functools
+import inspect
+import sys
+import threading
+import time
+import traceback
+from collections import Counter, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Iterator
+
+STACK_LIMIT = 12
+
+
+class _CallPhases:
+    """Phase timings of one tool call, plus where its longest single phase ran."""
+
+    __slots__ = ("durations", "longest", "stack")
+
+    def __init__(self) -> None:
+        self.durations: dict[str, float] = {}
+        self.longest = 0.0
+        self.stack: traceback.StackSummary | None = None
+
+
+_phases: ContextVar[_CallPhases | None] = ContextVar("call_phases", default=None)
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Add the time spent in the block to phase `name` of the current tool call.
+
+    Concurrent sub-calls of one tool call accumulate into the same phase, so
+    a phase may exceed the call's wall time. The stack of the longest single
+    block is kept (without source lines, at most `STACK_LIMIT` frames) for
+    the slow-call summary.
+    """
+    phases = _phases.get()
+    if phases is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        phases.durations[name] = phases.durations.get(name, 0.0) + elapsed
+        if elapsed > phases.longest:
+            phases.longest = elapsed
+            phases.stack = traceback.StackSummary.extract(
+                # Skip this generator and contextlib's __exit__.
+                traceback.walk_stack(sys._getframe(2)),  # pylint: disable=protected-access
+                limit=STACK_LIMIT,
+                lookup_lines=False,
+            )
+
+
+class SamplingProfiler:
+    """Wall-clock sampling profiler over all Python threads.
+
+    Args:
+        interval: Seconds between samples.
+        max_duration: Seconds after which sampling stops on its own.
+    """
+
+    def __init__(self, interval: float = 0.005, max_duration: float = 300.0) -> None:
+        self.interval = interval
+        self.max_duration = max_duration
+        self.samples = 0
+        self._stacks: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the sampler thread is active."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Clear previous samples and start sampling in a daemon thread."""
+        if self.running:
+            raise RuntimeError("Profiler is already running")
+        self._stacks.clear()
+        self.samples = 0
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling and wait for the sampler thread to exit."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def folded(self) -> str:
+        """Return the collected samples as folded stacks (``frame;frame count`` per line)."""
+        return "".join(f"{stack} {count}\n" for stack, count in self._stacks.most_common())
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        deadline = time.monotonic() + self.max_duration
+        while not self._stop.wait(self.interval) and time.monotonic() < deadline:
+            for ident, frame in sys._current_frames().items():  # pylint: disable=protected-access
+                if ident == own:
+                    continue
+                frames = []
+                while frame is not None:
+                    code = frame.f_code
+                    frames.append(f"{code.co_name} ({code.co_filename}:{frame.f_lineno})")
+                    frame = frame.f_back
+                if ident not in names:
+                    names = {thread.ident: thread.name for thread in threading.enumerate()}
+                frames.append(names.get(ident, str(ident)))
+                self._stacks[";".join(reversed(frames))] += 1
+            self.samples += 1
+
+
+class SlowCallLog:
+    """Ring buffer of tool calls that took longer than `threshold` seconds."""
+
+    def __init__(self, threshold: float, maxlen: int = 100) -> None:
+        self.threshold = threshold
+        self._entries: deque[dict[str, Any]] = deque(maxlen=maxlen)
+
+    def entries(self, limit: int | None = None) -> list[dict[str, Any]]:
+        """Return captured calls, most recent first."""
+        entries = list(reversed(self._entries))
+        return entries[:limit] if limit else entries
+
+    def clear(self) -> None:
+        """Forget all captured calls."""
+        self._entries.clear()
+
+    def capture(self, func: Callable) -> Callable:
+        """Decorate an async tool so calls slower than the threshold are recorded.
+
+        A captured function called from within another captured call (e.g. a
+        tool wrapped again by its MCP compaction stage) is timed as part of
+        the outer call only.
+        """
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if _phases.get() is not None:
+                return await func(*args, **kwargs)
+            phases = _CallPhases()
+            token = _phases.set(phases)
+            started = time.perf_counter()
+            error = None
+            try:
+                return await func(*args, **kwargs)
+            except Exception as exc:
+                error = repr(exc)
+                raise
+            finally:
+                duration = time.perf_counter() - started
+                _phases.reset(token)
+                if duration >= self.threshold:
+                    bound = signature.bind_partial(*args, **kwargs).arguments
+                    self._entries.append({
+                        "tool": func.__name__,
+                        "arguments": {key: repr(value)[:200] for key, value in bound.items()},
+                        "started_at": time.time() - duration,
+                        "duration": round(duration, 6),
+                        "phases": {key: round(value, 6) for key, value in phases.durations.items()},
+                        "slowest_phase": (
+                            max(phases.durations, key=phases.durations.get) if phases.durations else None
+                        ),
+                        "error": error,
+                        "stack": [
+                            f"{frame.filename}:{frame.lineno} {frame.name}"
+                            for frame in reversed(phases.stack or ())
+                        ],
+                    })
+
+        return wrapper
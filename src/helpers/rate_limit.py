@@ -0,0 +1,206 @@
+# src/helpers/rate_limit.py
+
+"""
+Rate limiting and fair scheduling module.
+
+Every caller of the application (MCP sessions and REST clients) shares the
+same upstream Aquarium capacity. This module provides:
+
+* a per-client, per-tool token-bucket `RateLimiter` that rejects calls with a
+  structured `RateLimitExceeded` error carrying a ``retry_after`` hint, and
+* a weighted fair-queuing `FairScheduler` that bounds concurrent upstream
+  calls and serves interactive clients ahead of batch jobs without starving
+  either.
+
+The calling client is identified through the `current_client` context
+variable, set per MCP session and per REST request.
+"""
+
+import asyncio
+import heapq
+import itertools
+import json
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any
+
+INTERACTIVE = "interactive"
+BATCH = "batch"
+
+
+@dataclass(frozen=True)
+class ClientIdentity:
+    """Who is calling, with which scheduling priority, and whether they are rate limited."""
+
+    key: str = "anonymous"
+    priority: str = INTERACTIVE
+    rate_limited: bool = True
+
+
+current_client: ContextVar[ClientIdentity] = ContextVar(
+    "current_client", default=ClientIdentity()
+)
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a client exceeds its rate limit for a tool."""
+
+    def __init__(self, tool: str, retry_after: float) -> None:
+        self.tool = tool
+        self.retry_after = retry_after
+        super().__init__(json.dumps(self.to_dict()))
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the structured error payload."""
+        return {
+            "error": "rate_limited",
+            "tool": self.tool,
+            "retry_after": round(self.retry_after, 3),
+        }
+
+
+class TokenBucket:
+    """Classic token bucket refilled continuously at `rate` tokens per second."""
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def acquire(self, now: float | None = None) -> float:
+        """Take one token.
+
+        Returns:
+            float: ``0.0`` if a token was taken, otherwise the seconds until one is available.
+        """
+        now = time.monotonic() if now is None else now
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class RateLimiter:
+    """Token buckets keyed by (client, tool), with optional per-tool rates.
+
+    Buckets are kept in LRU order and the least recently used are evicted
+    beyond `max_buckets`, which only ever forgives a client.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: float,
+        tool_rates: dict[str, float] | None = None,
+        max_buckets: int = 10_000,
+    ) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.tool_rates = tool_rates or {}
+        self.max_buckets = max_buckets
+        self._buckets: OrderedDict[tuple[str, str], TokenBucket] = OrderedDict()
+
+    def check(self, client: str, tool: str) -> None:
+        """Consume a token for `client` calling `tool`.
+
+        Raises:
+            RateLimitExceeded: If the client's bucket for the tool is empty.
+        """
+        if self.rate <= 0:
+            return
+        key = (client, tool)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            rate = self.tool_rates.get(tool, self.rate)
+            bucket = self._buckets[key] = TokenBucket(rate, max(self.burst, 1))
+            if len(self._buckets) > self.max_buckets:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+        retry_after = bucket.acquire()
+        if retry_after:
+            raise RateLimitExceeded(tool, retry_after)
+
+
+class FairScheduler:
+    """Weighted fair queuing in front of a bounded pool of upstream slots.
+
+    Each client is a flow; a waiting call is stamped with a virtual finish
+    time of ``max(virtual_now, client's last finish) + 1 / weight`` and slots
+    are handed to the smallest stamp first. A client flooding the queue only
+    pushes its own calls back, and higher-weight priorities advance faster.
+    """
+
+    def __init__(self, max_concurrency: int, weights: dict[str, float] | None = None) -> None:
+        self.max_concurrency = max(max_concurrency, 1)
+        self.weights = weights or {INTERACTIVE: 4.0, BATCH: 1.0}
+        self._active = 0
+        self._virtual_time = 0.0
+        self._finish: dict[str, float] = {}
+        self._waiters: list[tuple[float, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+
+    @property
+    def active(self) -> int:
+        """Number of calls currently holding an upstream slot."""
+        return self._active
+
+    @property
+    def queued(self) -> int:
+        """Number of calls waiting for an upstream slot."""
+        return sum(1 for _, _, future in self._waiters if not future.done())
+
+    async def acquire(self, identity: ClientIdentity) -> None:
+        """Wait for an upstream slot according to the client's fair share."""
+        if self._active < self.max_concurrency and not self.queued:
+            self._active += 1
+            return
+        weight = self.weights.get(identity.priority, 1.0)
+        start = max(self._virtual_time, self._finish.get(identity.key, 0.0))
+        finish = start + 1.0 / weight
+        self._finish[identity.key] = finish
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (finish, next(self._sequence), future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was handed over just as we were cancelled.
+                self.release()
+            raise
+
+    def release(self) -> None:
+        """Hand the slot to the next waiter in fair order, or free it."""
+        while self._waiters:
+            finish, _, future = heapq.heappop(self._waiters)
+            if future.done():
+                continue
+            self._virtual_time = finish
+            future.set_result(None)
+            break
+        else:
+            self._active -= 1
+            self._finish = {
+                key: value for key, value in self._finish.items() if value > self._virtual_time
+            }
+
+    async def __aenter__(self) -> "FairScheduler":
+        await self.acquire(current_client.get())
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self.release()
+
+
+def parse_tool_rates(spec: str) -> dict[str, float]:
+    """Parse ``"tool=rate,tool=rate"`` into a mapping of per-tool rates."""
+    rates: dict[str, float] = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        tool, _, rate = item.partition("=")
+        rates[tool.strip()] = float(rate)
+    return rates
@@ -0,0 +1,338 @@
+# src/helpers/replay.py
+
+"""
+Record/replay module.
+
+`ReplayClient` wraps the Aquarium client and stores every upstream response
+in a compact on-disk `ReplayStore` (SQLite, zlib-compressed pickles) keyed by
+method and arguments. It runs in one of three modes:
+
+* ``record`` calls the real client and writes each response through to the
+  store. When the upstream call fails, the last recorded response for the
+  same call is served instead (last-known-good fallback).
+* ``fallback`` behaves like ``record`` but refreshes a call's stored
+  response at most once per refresh interval, so it can stay enabled in
+  production purely for the last-known-good fallback.
+* ``replay`` never touches the upstream and serves recorded responses,
+  optionally sleeping for the recorded latency, for deterministic load tests
+  and profiling.
+
+Fallback responses are reported to the enclosing `track_fallbacks()` scope
+so callers can mark the result as stale. The store can be bounded by age and
+row count.
+"""
+
+import asyncio
+import hashlib
+import json
+import pickle
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterator, NamedTuple
+from src.helpers.async_client import detach
+from src.helpers.lazy_client import LazyClient
+from src.helpers.logger import get_logger
+
+logger = get_logger(__name__)
+
+RECORD = "record"
+REPLAY = "replay"
+FALLBACK = "fallback"
+
+
+class ReplayMiss(LookupError):
+    """Raised in replay mode when no response was recorded for a call."""
+
+    def __init__(self, method: str) -> None:
+        self.method = method
+        super().__init__(f"No recorded response for {method} with these arguments")
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the structured error payload."""
+        return {"error": "replay_miss", "tool": self.method}
+
+
+class Recording(NamedTuple):
+    """A stored upstream response."""
+
+    value: Any
+    latency: float
+    recorded_at: float
+
+
+class FallbackMarker:
+    """Collects whether a scope was served last-known-good responses, and how old they are."""
+
+    def __init__(self) -> None:
+        self.recorded_at: float | None = None
+
+    @property
+    def stale(self) -> bool:
+        """Whether any response in the scope came from the fallback."""
+        return self.recorded_at is not None
+
+    def note(self, recorded_at: float) -> None:
+        """Record that a response recorded at `recorded_at` was served; the oldest wins."""
+        if self.recorded_at is None or recorded_at < self.recorded_at:
+            self.recorded_at = recorded_at
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the staleness metadata attached to results."""
+        if self.recorded_at is None:
+            return {"stale": False}
+        recorded = datetime.fromtimestamp(self.recorded_at, tz=timezone.utc)
+        return {"stale": True, "recorded_at": recorded.isoformat()}
+
+
+_fallbacks: ContextVar[FallbackMarker | None] = ContextVar("replay_fallbacks", default=None)
+
+
+@contextmanager
+def track_fallbacks() -> Iterator[FallbackMarker]:
+    """Collect the fallback responses served to calls made inside the block.
+
+    Fallbacks seen by a nested scope are also reported to the enclosing one.
+    """
+    marker = FallbackMarker()
+    token = _fallbacks.set(marker)
+    try:
+        yield marker
+    finally:
+        _fallbacks.reset(token)
+        parent = _fallbacks.get()
+        if parent is not None and marker.recorded_at is not None:
+            parent.note(marker.recorded_at)
+
+
+class StaleResponseMiddleware:
+    """ASGI middleware that flags HTTP responses built from last-known-good fallbacks.
+
+    Such responses get a ``Warning: 110`` header, an ``X-Aquarium-Recorded-At``
+    header with the age of the oldest fallback used, and ``Cache-Control: no-store``.
+    """
+
+    def __init__(self, app: Any) -> None:
+        self.app = app
+
+    async def __call__(self, scope: dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        with track_fallbacks() as marker:
+
+            async def send_marked(message: dict[str, Any]) -> None:
+                if message["type"] == "http.response.start" and marker.stale:
+                    headers = [
+                        (name, value)
+                        for name, value in message.get("headers", [])
+                        if name.lower() != b"cache-control"
+                    ]
+                    headers += [
+                        (b"warning", b'110 - "Response is Stale"'),
+                        (b"x-aquarium-recorded-at", marker.to_dict()["recorded_at"].encode()),
+                        (b"cache-control", b"no-store"),
+                    ]
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            await self.app(scope, receive, send_marked)
+
+
+def call_key(method: str, args: tuple, kwargs: dict[str, Any]) -> str:
+    """Return the store key of a call: a hash of its method and arguments."""
+    encoded = json.dumps([method, list(args), kwargs], sort_keys=True, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class ReplayStore:
+    """SQLite-backed store of upstream responses, safe to use from worker threads.
+
+    Args:
+        path: The SQLite database file.
+        max_age: Seconds after which a response is neither served nor kept; ``0`` keeps it forever.
+        max_rows: Number of most recent responses kept; ``0`` keeps all of them.
+    """
+
+    # Retention is enforced on open and then once every this many writes.
+    PRUNE_EVERY = 256
+
+    def __init__(self, path: str, max_age: float = 0.0, max_rows: int = 0) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True, mode=0o700)
+        self.max_age = max_age
+        self.max_rows = max_rows
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY, method TEXT NOT NULL, payload BLOB NOT NULL,"
+                " latency REAL NOT NULL, recorded_at REAL NOT NULL)"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS responses_recorded_at ON responses (recorded_at)"
+            )
+        self.prune()
+
+    def put(self, method: str, args: tuple, kwargs: dict[str, Any], value: Any, latency: float) -> None:
+        """Record `value` as the response of the call, replacing any previous one."""
+        payload = zlib.compress(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                (call_key(method, args, kwargs), method, payload, latency, time.time()),
+            )
+            self._writes += 1
+            due = self._writes % self.PRUNE_EVERY == 0
+        if due:
+            self.prune()
+
+    def get(self, method: str, args: tuple, kwargs: dict[str, Any]) -> Recording | None:
+        """Return the response recorded for the call, or ``None`` if there is none within `max_age`."""
+        oldest = time.time() - self.max_age if self.max_age else 0.0
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT payload, latency, recorded_at FROM responses WHERE key = ? AND recorded_at >= ?",
+                (call_key(method, args, kwargs), oldest),
+            ).fetchone()
+        if row is None:
+            return None
+        return Recording(pickle.loads(zlib.decompress(row[0])), row[1], row[2])
+
+    def prune(self) -> int:
+        """Delete responses older than `max_age` or beyond the newest `max_rows`.
+
+        Returns:
+            int: The number of deleted responses.
+        """
+        deleted = 0
+        with self._lock, self._connection:
+            if self.max_age:
+                deleted += self._connection.execute(
+                    "DELETE FROM responses WHERE recorded_at < ?", (time.time() - self.max_age,)
+                ).rowcount
+            if self.max_rows:
+                deleted += self._connection.execute(
+                    "DELETE FROM responses WHERE key IN (SELECT key FROM responses"
+                    " ORDER BY recorded_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_rows,),
+                ).rowcount
+        if deleted:
+            logger.info("Pruned %d recorded Aquarium responses", deleted)
+        return deleted
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._connection.close()
+
+
+class ReplayClient:
+    """Record/replay facade with the same method surface as the wrapped client.
+
+    Args:
+        client: The real client (sync, async or `LazyClient`); unused in replay mode.
+        store: Where responses are recorded and replayed from.
+        mode: ``"record"``, ``"fallback"`` or ``"replay"``.
+        latency_scale: Multiplier applied to recorded latency when replaying; ``0`` disables it.
+        refresh_interval: In fallback mode, seconds before a call's stored response is rewritten.
+    """
+
+    # Calls whose last write time is remembered in fallback mode.
+    MAX_TRACKED_CALLS = 10_000
+
+    def __init__(
+        self,
+        client: Any,
+        store: ReplayStore,
+        mode: str,
+        latency_scale: float = 0.0,
+        refresh_interval: float = 300.0,
+    ) -> None:
+        if mode not in (RECORD, REPLAY, FALLBACK):
+            raise ValueError(f"Unknown replay mode: {mode}")
+        self.client = client
+        self.store = store
+        self.mode = mode
+        self.latency_scale = latency_scale
+        self.refresh_interval = refresh_interval if mode == FALLBACK else 0.0
+        self._written: OrderedDict[str, float] = OrderedDict()
+
+    def _due(self, key: str) -> bool:
+        """Whether the response of the call with store key `key` should be written now."""
+        if not self.refresh_interval:
+            return True
+        now = time.monotonic()
+        written = self._written.get(key)
+        if written is not None and now - written < self.refresh_interval:
+            return False
+        self._written[key] = now
+        self._written.move_to_end(key)
+        if len(self._written) > self.MAX_TRACKED_CALLS:
+            self._written.popitem(last=False)
+        return True
+
+    async def call(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        """Serve `method` according to the mode.
+
+        Raises:
+            ReplayMiss: In replay mode, if the call was never recorded.
+        """
+        if self.mode == REPLAY:
+            recorded = await asyncio.to_thread(self.store.get, method, args, kwargs)
+            if recorded is None:
+                raise ReplayMiss(method)
+            if self.latency_scale:
+                await asyncio.sleep(recorded.latency * self.latency_scale)
+            return recorded.value
+
+        started = time.perf_counter()
+        try:
+            client = self.client
+            if isinstance(client, LazyClient):
+                client = await client.aget()
+            value = getattr(client, method)(*args, **kwargs)
+            if asyncio.iscoroutine(value):
+                value = await value
+        except Exception as exc:
+            recorded = await asyncio.to_thread(self.store.get, method, args, kwargs)
+            if recorded is None:
+                raise
+            # A timed-out worker call keeps running; its owner must not free its slot yet.
+            detach(exc)
+            logger.warning("Serving last-known-good %s response after upstream error: %s", method, exc)
+            marker = _fallbacks.get()
+            if marker is not None:
+                marker.note(recorded.recorded_at)
+            return recorded.value
+        if not self._due(call_key(method, args, kwargs)):
+            return value
+        try:
+            await asyncio.to_thread(
+                self.store.put, method, args, kwargs, value, time.perf_counter() - started
+            )
+        except (pickle.PicklingError, TypeError, AttributeError, sqlite3.Error) as exc:
+            logger.warning("Could not record %s response: %s", method, exc)
+        return value
+
+    def __getattr__(self, method: str) -> Any:
+        if method.startswith("_"):
+            raise AttributeError(method)
+
+        async def replayed(*args: Any, **kwargs: Any) -> Any:
+            return await self.call(method, *args, **kwargs)
+
+        replayed.__name__ = method
+        return replayed
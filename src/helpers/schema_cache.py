@@ -0,0 +1,160 @@
+# src/helpers/schema_cache.py
+
+"""
+Persistent schema cache module.
+
+Parsing the Aquarium WSDL and building the SOAP type plans is the most
+expensive part of constructing `AquariumClient`. This module pickles the
+parsed service definition (not the client) to disk, keyed by a hash of the
+WSDL document and the cache format, Python and `crm-aq` versions, so new
+workers and restarts skip the parse. A changed WSDL produces a new key; stale
+entries are removed when the new one is written.
+
+Every process still constructs and authenticates its own client around the
+cached definition. HTTP sessions and transports reachable from the cached
+objects are left out of the pickle, so no credentials or cookies reach disk.
+"""
+
+import hashlib
+import io
+import os
+import pickle
+import sys
+import tempfile
+from importlib import metadata
+from pathlib import Path
+from typing import Any, Callable
+from urllib.parse import urlparse
+import httpx
+from src.helpers.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Bump when the on-disk layout or pickled content changes incompatibly.
+CACHE_FORMAT_VERSION = 3
+
+# Class names of SOAP transports, which own the authenticated HTTP session.
+_TRANSPORT_TYPES = ("Transport", "AsyncTransport")
+
+
+def _package_version(name: str) -> str:
+    """Return the installed version of `name`, or an empty string."""
+    try:
+        return metadata.version(name)
+    except metadata.PackageNotFoundError:
+        return ""
+
+
+def _is_transport(obj: Any) -> bool:
+    """Whether `obj` is an HTTP session or SOAP transport that may carry credentials."""
+    if isinstance(obj, (httpx.Client, httpx.AsyncClient)) or type(obj).__name__ in _TRANSPORT_TYPES:
+        return True
+    return not isinstance(obj, type) and hasattr(obj, "cookies") and hasattr(obj, "mount")
+
+
+class _SchemaPickler(pickle.Pickler):
+    """Pickler that stores sessions and transports as empty references."""
+
+    def persistent_id(self, obj: Any) -> str | None:
+        return "transport" if _is_transport(obj) else None
+
+
+class _SchemaUnpickler(pickle.Unpickler):
+    """Unpickler that restores the references left by `_SchemaPickler` as ``None``."""
+
+    def persistent_load(self, pid: Any) -> None:
+        return None
+
+
+class SchemaCache:
+    """On-disk cache of the parsed service definition behind a SOAP client.
+
+    The cache directory holds pickled objects and must only be writable by the
+    service account: entries are unpickled without further validation.
+    """
+
+    def __init__(self, directory: str, wsdl_url: str, timeout: float = 10.0) -> None:
+        self.directory = Path(directory) / f"v{CACHE_FORMAT_VERSION}"
+        self.wsdl_url = wsdl_url
+        self.timeout = timeout
+
+    def _read_wsdl(self) -> bytes:
+        """Return the raw WSDL document from a URL or a local path."""
+        parsed = urlparse(self.wsdl_url)
+        if parsed.scheme in ("http", "https"):
+            response = httpx.get(self.wsdl_url, timeout=self.timeout, follow_redirects=True)
+            response.raise_for_status()
+            return response.content
+        path = parsed.path if parsed.scheme == "file" else self.wsdl_url
+        return Path(path).read_bytes()
+
+    def fingerprint(self) -> str | None:
+        """Return the cache key for the current WSDL, or ``None`` if it can't be read."""
+        try:
+            document = self._read_wsdl()
+        except (httpx.HTTPError, OSError) as exc:
+            logger.warning("Could not fingerprint WSDL %s: %s", self.wsdl_url, exc)
+            return None
+        digest = hashlib.sha256(document)
+        digest.update(f"|py{sys.version_info[:2]}|crm-aq{_package_version('crm-aq')}".encode())
+        return digest.hexdigest()
+
+    def _load(self, path: Path) -> Any:
+        """Unpickle the entry at `path`, returning ``None`` if it is missing or unreadable."""
+        try:
+            with path.open("rb") as handle:
+                return _SchemaUnpickler(handle).load()
+        except FileNotFoundError:
+            return None
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError) as exc:
+            logger.warning("Discarding unreadable schema cache entry %s: %s", path, exc)
+            path.unlink(missing_ok=True)
+            return None
+
+    def _store(self, path: Path, value: Any) -> None:
+        """Atomically write `value` to `path` and drop entries for other WSDL versions."""
+        buffer = io.BytesIO()
+        try:
+            _SchemaPickler(buffer, protocol=pickle.HIGHEST_PROTOCOL).dump(value)
+        except (pickle.PicklingError, TypeError, AttributeError) as exc:
+            logger.warning("Service definition is not picklable, schema cache disabled: %s", exc)
+            return
+        payload = buffer.getvalue()
+        self.directory.mkdir(parents=True, exist_ok=True, mode=0o700)
+        fd, tmp_name = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(payload)
+            os.replace(tmp_name, path)
+        except OSError as exc:
+            logger.warning("Could not write schema cache entry %s: %s", path, exc)
+            Path(tmp_name).unlink(missing_ok=True)
+            return
+        for stale in self.directory.glob("*.pkl"):
+            if stale != path:
+                stale.unlink(missing_ok=True)
+
+    def load_or_build(
+        self, build: Callable[[Any | None], Any], extract: Callable[[Any], Any]
+    ) -> Any:
+        """Build a client, reusing the cached service definition for the current WSDL.
+
+        Args:
+            build: Constructs and authenticates a fresh client. It is passed the
+                cached service definition, or ``None`` on a miss.
+            extract: Returns the service definition of a client built on a
+                miss (or ``None`` if it has none), which is then cached.
+        """
+        key = self.fingerprint()
+        if key is None:
+            return build(None)
+        path = self.directory / f"{key}.pkl"
+        schema = self._load(path)
+        if schema is not None:
+            logger.info("Loaded Aquarium schema cache %s", path.name)
+            return build(schema)
+        client = build(None)
+        schema = extract(client)
+        if schema is not None:
+            self._store(path, schema)
+        return client
@@ -0,0 +1,273 @@
+# src/helpers/spill.py
+
+"""
+Memory-bounded result module.
+
+Large tool results (a long event history, every case of a big account) used
+to be materialized as SDK objects, then dicts, then JSON at the same time.
+`SpillStore.collect` converts results one item at a time against a
+per-request byte budget and a global budget shared by all in-flight
+collections. Once a budget is exceeded, the remaining items are streamed as
+JSON into a temp file. The caller gets a short preview plus an ID from which
+the full payload can be served, either as a file or page by page within the
+per-request budget.
+
+Memory held by a returned result stays reserved until the caller's
+`reservation()` block exits, so the response can be encoded before the
+budget is handed to another request. Spill IDs are derived from the payload,
+so the same result maps to the same file (and ETag) every time.
+"""
+
+import contextlib
+import hashlib
+import itertools
+import json
+import os
+import tempfile
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator
+from src.helpers.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class SpilledResult:
+    """A tool result that was written to disk instead of kept in memory."""
+
+    result_id: str
+    tool: str
+    path: Path
+    total_items: int
+    size: int
+    created: float
+
+    def describe(self) -> dict[str, Any]:
+        """Return the metadata handed to callers in place of the full payload."""
+        return {
+            "truncated": True,
+            "tool": self.tool,
+            "total_items": self.total_items,
+            "bytes": self.size,
+            "resource_uri": f"aquarium://results/{self.result_id}",
+            "url": f"/aquarium/results/{self.result_id}",
+        }
+
+
+class SpillStore:
+    """Bounded in-memory result collection with spill-to-disk.
+
+    Args:
+        directory: Where spilled payloads are written.
+        request_budget: Bytes of encoded items a single result may hold in memory.
+        global_budget: Bytes all in-flight collections may hold in memory together.
+        preview_items: Items returned inline when a result is spilled.
+        ttl: Seconds a spilled payload stays retrievable.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        request_budget: int,
+        global_budget: int,
+        preview_items: int = 20,
+        ttl: float = 900.0,
+    ) -> None:
+        self.directory = Path(directory)
+        self.request_budget = request_budget
+        self.global_budget = global_budget
+        self.preview_items = preview_items
+        self.ttl = ttl
+        self._in_memory = 0
+        self._lock = threading.Lock()
+        self._results: dict[str, SpilledResult] = {}
+        self._lease: ContextVar[list[int] | None] = ContextVar("spill_lease", default=None)
+
+    @property
+    def in_memory(self) -> int:
+        """Bytes currently held by in-flight collections."""
+        return self._in_memory
+
+    def _reserve(self, size: int, force: bool = False) -> bool:
+        with self._lock:
+            if not force and self._in_memory + size > self.global_budget:
+                return False
+            self._in_memory += size
+            return True
+
+    def _release(self, size: int) -> None:
+        with self._lock:
+            self._in_memory -= size
+
+    @contextlib.contextmanager
+    def reservation(self) -> Iterator[None]:
+        """Keep the memory of results collected in this block reserved until it exits.
+
+        Wrap a tool call together with the encoding of its response. Outside
+        a reservation, `collect` releases its memory as soon as it returns.
+        """
+        lease = [0]
+        token = self._lease.set(lease)
+        try:
+            yield
+        finally:
+            self._lease.reset(token)
+            self._release(lease[0])
+
+    def collect(
+        self, tool: str, items: Iterable[Any], convert: Callable[[Any], Any]
+    ) -> tuple[list[Any], SpilledResult | None]:
+        """Convert `items`, spilling to disk if a memory budget is exceeded.
+
+        Returns:
+            tuple: ``(rows, None)`` with every converted item when the result
+            fits in memory, otherwise ``(preview_rows, spilled_result)``.
+        """
+        rows: list[Any] = []
+        held = 0
+        iterator = iter(items)
+        try:
+            for item in iterator:
+                row = convert(item)
+                size = len(json.dumps(row, default=str).encode("utf-8")) + 1
+                if held + size > self.request_budget or not self._reserve(size):
+                    return self._spill(tool, rows, row, iterator, convert)
+                rows.append(row)
+                held += size
+            held = self._hand_to_lease(held)
+            return rows, None
+        finally:
+            self._release(held)
+
+    def _hand_to_lease(self, held: int) -> int:
+        """Move `held` bytes to the active `reservation()`, returning what is left to release."""
+        lease = self._lease.get()
+        if lease is None:
+            return held
+        lease[0] += held
+        return 0
+
+    def read_page(self, spilled: SpilledResult, start: int = 0) -> dict[str, Any]:
+        """Return the items of `spilled` from index `start`, up to the per-request budget.
+
+        The file is read one item per line, so only the returned page is held
+        in memory, and it is charged to the global budget like `collect`.
+        At least one item is returned so callers can always make progress.
+
+        Returns:
+            dict: ``items``, ``start``, ``next_start`` (``None`` on the last
+            page) and ``total_items``.
+        """
+        items: list[Any] = []
+        held = 0
+        next_start = None
+        try:
+            with spilled.path.open(encoding="utf-8") as handle:
+                for index, line in enumerate(itertools.islice(handle, start + 1, None), start):
+                    line = line.rstrip().rstrip(",")
+                    if line == "]":
+                        break
+                    size = len(line.encode("utf-8")) + 1
+                    over_budget = held + size > self.request_budget
+                    if items and (over_budget or not self._reserve(size)):
+                        next_start = index
+                        break
+                    if not items:
+                        self._reserve(size, force=True)
+                    items.append(json.loads(line))
+                    held += size
+            held = self._hand_to_lease(held)
+        finally:
+            self._release(held)
+        return {
+            "items": items,
+            "start": start,
+            "next_start": next_start,
+            "total_items": spilled.total_items,
+        }
+
+    def _spill(
+        self,
+        tool: str,
+        rows: list[Any],
+        row: Any,
+        remaining: Iterable[Any],
+        convert: Callable[[Any], Any],
+    ) -> tuple[list[Any], SpilledResult]:
+        """Stream `rows`, `row` and the rest of `remaining` into a file named by its content."""
+        self.purge_expired()
+        self.directory.mkdir(parents=True, exist_ok=True, mode=0o700)
+        fd, name = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        preview = rows[: self.preview_items]
+        total = 0
+        digest = hashlib.sha256(tool.encode("utf-8") + b"\0")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                # One item per line so `read_page` can page through the file.
+                handle.write("[\n")
+                for index, value in enumerate(itertools.chain(rows, [row], map(convert, remaining))):
+                    chunk = (",\n" if index else "") + json.dumps(value, default=str)
+                    handle.write(chunk)
+                    digest.update(chunk.encode("utf-8"))
+                    if len(preview) < self.preview_items and index >= len(rows):
+                        preview.append(value)
+                    total += 1
+                handle.write("\n]\n")
+            rows.clear()
+            result_id = digest.hexdigest()[:32]
+            path = self.directory / f"{result_id}.json"
+            if path.exists():
+                # Same payload spilled before: keep the existing file and its ETag.
+                os.utime(path)
+            else:
+                os.replace(name, path)
+        finally:
+            Path(name).unlink(missing_ok=True)
+        spilled = SpilledResult(
+            result_id=result_id,
+            tool=tool,
+            path=path,
+            total_items=total,
+            size=path.stat().st_size,
+            created=time.monotonic(),
+        )
+        with self._lock:
+            self._results[spilled.result_id] = spilled
+        logger.info(
+            "Spilled %s result (%s items, %s bytes) to %s", tool, total, spilled.size, path
+        )
+        return preview, spilled
+
+    def get(self, result_id: str) -> SpilledResult | None:
+        """Return the spilled result with `result_id`, or ``None`` if unknown or expired.
+
+        Expired files are left to `purge_expired`, which scans the directory and
+        so runs off the event loop (at startup and when spilling).
+        """
+        with self._lock:
+            spilled = self._results.get(result_id)
+        if spilled is None or spilled.created < time.monotonic() - self.ttl:
+            return None
+        return spilled
+
+    def purge_expired(self) -> None:
+        """Delete spilled payloads older than the TTL, including files left by earlier runs."""
+        cutoff = time.monotonic() - self.ttl
+        with self._lock:
+            expired = [key for key, value in self._results.items() if value.created < cutoff]
+            for key in expired:
+                self._results.pop(key).path.unlink(missing_ok=True)
+            known = set(self._results)
+        if not self.directory.is_dir():
+            return
+        file_cutoff = time.time() - self.ttl
+        for path in self.directory.iterdir():
+            try:
+                if path.stem not in known and path.stat().st_mtime < file_cutoff:
+                    path.unlink()
+            except FileNotFoundError:
+                continue
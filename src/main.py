@@ -3,13 +3,46 @@
 Main FastAPI application integrating SSE/MCP and Aquarium API routes.
 """
 
+import asyncio
+import math
+import uuid
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse
 from mcp.server.sse import SseServerTransport
 from starlette.routing import Mount
-from src.aq_mcp_server import mcp, router as aquarium_router
+from src.admin_routes import router as admin_router
+from src.aq_mcp_server import (
+    change_feed,
+    mcp,
+    release_session_subscriptions,
+    router as aquarium_router,
+    spill_store,
+    warm_up_client,
+)
 from src.config import config
+from src.helpers.async_client import UpstreamTimeout
+from src.helpers.replay import ReplayMiss, StaleResponseMiddleware
+from src.helpers.rate_limit import BATCH, INTERACTIVE, ClientIdentity, RateLimitExceeded, current_client
 from src.routes import router as general_router
 
+try:
+    from brotli_asgi import BrotliMiddleware  # pylint: disable=import-error
+except ImportError:  # brotli is optional, gzip is always available
+    BrotliMiddleware = None
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    """Purge stale spilled results, optionally warm up the Aquarium client and stop the change feed on shutdown."""
+    await asyncio.to_thread(spill_store.purge_expired)
+    if config.AQUARIUM_WARMUP:
+        await warm_up_client()
+    yield
+    await change_feed.stop()
+
+
 # Create FastAPI application with metadata
 app = FastAPI(
     title="FastAPI MCP SSE",
@@ -17,8 +50,40 @@ app = FastAPI(
     "Protocol integration",
     version="0.1.0",
     servers=[{"url": config.GROK_URL}],
+    lifespan=lifespan,
 )
 
+# Compress responses above the size threshold (brotli when installed, else gzip)
+if BrotliMiddleware is not None:
+    app.add_middleware(
+        BrotliMiddleware, minimum_size=config.COMPRESSION_MINIMUM_SIZE, gzip_fallback=True
+    )
+else:
+    app.add_middleware(GZipMiddleware, minimum_size=config.COMPRESSION_MINIMUM_SIZE)
+
+# Flag responses served from the last-known-good fallback as stale
+app.add_middleware(StaleResponseMiddleware)
+
+
+@app.exception_handler(RateLimitExceeded)
+async def rate_limit_exceeded_handler(_request: Request, exc: RateLimitExceeded):
+    """Return a structured 429 response with a `Retry-After` header."""
+    return JSONResponse(
+        exc.to_dict(),
+        status_code=429,
+        headers={"Retry-After": str(math.ceil(exc.retry_after))},
+    )
+
+@app.exception_handler(UpstreamTimeout)
+async def upstream_timeout_handler(_request: Request, exc: UpstreamTimeout):
+    """Return a structured 504 response when Aquarium does not answer in time."""
+    return JSONResponse(exc.to_dict(), status_code=504)
+
+@app.exception_handler(ReplayMiss)
+async def replay_miss_handler(_request: Request, exc: ReplayMiss):
+    """Return a structured 503 response when replay mode has no recording for a call."""
+    return JSONResponse(exc.to_dict(), status_code=503)
+
 # Create SSE transport instance for handling server-sent events
 sse = SseServerTransport("/messages/")
 
@@ -46,20 +111,35 @@ async def handle_sse(request: Request):
 
     This endpoint establishes a Server-Sent Events connection with the client
     and forwards communication to the Model Context Protocol server.
+    Each connection is rate limited as its own client; pass `?priority=batch`
+    to schedule the session's tool calls as batch work.
     """
+    priority = BATCH if request.query_params.get("priority") == BATCH else INTERACTIVE
+    identity = ClientIdentity(f"mcp:{uuid.uuid4().hex}", priority)
+    current_client.set(identity)
     # Use sse.connect_sse to establish an SSE connection with the MCP server
     async with sse.connect_sse(request.scope, request.receive, request._send) as (  # pylint: disable=protected-access
         read_stream,
         write_stream,
     ):
+        init_options = mcp._mcp_server.create_initialization_options()  # pylint: disable=protected-access
+        # Resource subscriptions are served by the Aquarium change feed
+        if init_options.capabilities.resources is not None:
+            init_options.capabilities.resources.subscribe = True
         # Run the MCP server with the established streams
-        await mcp._mcp_server.run(  # pylint: disable=protected-access
-            read_stream,
-            write_stream,
-            mcp._mcp_server.create_initialization_options(),  # pylint: disable=protected-access
-        )
+        try:
+            await mcp._mcp_server.run(  # pylint: disable=protected-access
+                read_stream,
+                write_stream,
+                init_options,
+            )
+        finally:
+            # Sessions that disconnect without unsubscribing must not stay in the feed
+            release_session_subscriptions(identity.key)
 
 # Include Aquarium API endpoints in the main app
 app.include_router(aquarium_router)
 # Include general application routes
 app.include_router(general_router)
+# Include admin-only diagnostics routes
+app.include_router(admin_router)
@@ -1,16 +1,30 @@
 import sys
 import types
 
+import pytest
+
 # Stub out external dependencies for testing
 # ----- mcp.server.fastmcp -----
 mcp = types.ModuleType("mcp")
 mcp.server = types.ModuleType("mcp.server")
 fastmcp_mod = types.ModuleType("mcp.server.fastmcp")
+class FakeLowLevelServer:
+    def subscribe_resource(self):
+        def decorator(func): return func
+        return decorator
+    def unsubscribe_resource(self):
+        def decorator(func): return func
+        return decorator
 class FakeFastMCP:
-    def __init__(self, name): self.name = name
+    def __init__(self, name):
+        self.name = name
+        self._mcp_server = FakeLowLevelServer()
     def tool(self):
         def decorator(func): return func
         return decorator
+    def resource(self, uri):
+        def decorator(func): return func
+        return decorator
 fastmcp_mod.FastMCP = FakeFastMCP
 sys.modules["mcp"] = mcp
 sys.modules["mcp.server"] = mcp.server
@@ -88,4 +102,11 @@ class Faker:
         return random.randint(min, max)
     def word(self): return "word"
 faker_mod.Faker = Faker
-sys.modules["faker"] = faker_mod
\ No newline at end of file
+sys.modules["faker"] = faker_mod
+
+@pytest.fixture(autouse=True)
+def _clear_customer_resolutions():
+    # Customer lookups are cached by email; keep tests independent
+    yield
+    import src.aq_mcp_server as server
+    server._customer_resolutions.clear()
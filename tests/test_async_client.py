@@ -0,0 +1,96 @@
+import asyncio
+import threading
+import time
+import types
+
+import pytest
+from fastapi.testclient import TestClient
+
+import src.aq_mcp_server as server
+import src.main as main_module
+from src.helpers.async_client import AQUARIUM_METHODS, AsyncAquariumClient, UpstreamTimeout
+
+
+class SlowClient:
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.threads = set()
+    def get_event_history(self, case_id):
+        self.threads.add(threading.get_ident())
+        time.sleep(self.delay)
+        return [{"case_id": case_id}]
+    def get_detail_values_by_field_ids(self, field_ids, case_id=None, lead_id=None, matter_id=None):
+        return [{"field_ids": field_ids, "case_id": case_id}]
+
+def test_adapter_exposes_client_surface():
+    for name in AQUARIUM_METHODS:
+        assert asyncio.iscoroutinefunction(getattr(AsyncAquariumClient, name))
+
+def test_adapter_runs_off_the_event_loop():
+    sync_client = SlowClient()
+    adapter = AsyncAquariumClient(sync_client, max_workers=4)
+
+    async def run():
+        started = time.perf_counter()
+        results = await asyncio.gather(*(adapter.get_event_history(i) for i in range(4)))
+        return results, time.perf_counter() - started
+
+    results, elapsed = asyncio.run(run())
+    assert results == [[{"case_id": i}] for i in range(4)]
+    assert elapsed < 4 * sync_client.delay
+    assert threading.get_ident() not in sync_client.threads
+
+def test_adapter_passes_keyword_arguments():
+    adapter = AsyncAquariumClient(SlowClient())
+    result = asyncio.run(adapter.get_detail_values_by_field_ids(field_ids=[1], case_id=2))
+    assert result == [{"field_ids": [1], "case_id": 2}]
+
+def test_adapter_times_out():
+    adapter = AsyncAquariumClient(SlowClient(delay=0.5), timeout=0.01)
+    with pytest.raises(UpstreamTimeout):
+        asyncio.run(adapter.get_event_history(1))
+
+def test_tools_await_async_client(monkeypatch):
+    sync_client = type("C", (), {"get_event_history": lambda self, case_id: [types.SimpleNamespace(case_id=case_id)]})()
+    monkeypatch.setattr(server, "aquarium_client", AsyncAquariumClient(sync_client))
+    assert asyncio.run(server.get_event_history(3)) == [{"case_id": 3}]
+
+def test_rest_route_returns_504_on_timeout(monkeypatch):
+    monkeypatch.setattr(server, "aquarium_client", AsyncAquariumClient(SlowClient(delay=0.5), timeout=0.01))
+    response = TestClient(main_module.app).get("/aquarium/event-history/1")
+    assert response.status_code == 504
+    assert response.json()["error"] == "upstream_timeout"
+
+def test_timed_out_call_holds_worker_slot_until_thread_returns():
+    adapter = AsyncAquariumClient(SlowClient(delay=0.2), max_workers=1, timeout=0.01)
+
+    async def run():
+        with pytest.raises(UpstreamTimeout) as info:
+            await adapter.get_event_history(1)
+        held = adapter._limiter.borrowed_tokens
+        await info.value.pending
+        return held, adapter._limiter.borrowed_tokens
+
+    assert asyncio.run(run()) == (1, 0)
+
+def test_timed_out_call_holds_scheduler_slot(monkeypatch):
+    monkeypatch.setattr(server, "aquarium_client", AsyncAquariumClient(SlowClient(delay=0.2), timeout=0.01))
+    scheduler = server.FairScheduler(max_concurrency=1)
+    monkeypatch.setattr(server, "upstream_scheduler", scheduler)
+
+    async def run():
+        with pytest.raises(UpstreamTimeout):
+            await server.get_event_history(1)
+        held = scheduler.active
+        await asyncio.sleep(0.4)
+        return held, scheduler.active
+
+    assert asyncio.run(run()) == (1, 0)
+
+def test_transport_timeout_is_configured():
+    adapters = pytest.importorskip("requests.adapters")
+    mounted = {}
+    session = types.SimpleNamespace(mount=lambda prefix, adapter: mounted.setdefault(prefix, adapter))
+    AsyncAquariumClient(types.SimpleNamespace(session=session), max_workers=2, timeout=5)
+    assert isinstance(mounted["https://"], adapters.HTTPAdapter)
+    assert mounted["https://"].timeout == 5
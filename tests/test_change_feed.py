@@ -0,0 +1,193 @@
+import asyncio
+import types
+
+from fastapi.testclient import TestClient
+
+import src.aq_mcp_server as server
+import src.main as main_module
+from src.helpers.change_feed import ChangeFeed, Subscription, diff_snapshots
+
+
+def test_diff_snapshots():
+    assert diff_snapshots("Open", "Open") is None
+    assert diff_snapshots("Open", "Closed") == {
+        "type": "update", "value": "Closed", "previous": "Open"
+    }
+    change = diff_snapshots([{"id": 1}], [{"id": 1}, {"id": 2}])
+    assert change == {"type": "update", "added": [{"id": 2}], "removed": []}
+
+def test_one_upstream_poll_for_many_subscribers():
+    calls = []
+    statuses = {"value": "Open"}
+
+    async def fetch(matter_id):
+        calls.append(matter_id)
+        return statuses["value"]
+
+    async def run():
+        feed = ChangeFeed({"matter_status": fetch}, interval=3600)
+        received = {key: [] for key in range(3)}
+        for key in received:
+            async def callback(change, key=key):
+                received[key].append(change)
+            await feed.subscribe(("matter_status", 7), key, callback)
+        await feed.poll_once()
+        await feed.poll_once()
+        statuses["value"] = "Closed"
+        await feed.poll_once()
+        for key in received:
+            feed.unsubscribe(("matter_status", 7), key)
+        assert feed.topics == []
+        return received
+
+    received = asyncio.run(run())
+    assert calls.count(7) >= 3 and len(calls) <= 4
+    for changes in received.values():
+        assert [c["type"] for c in changes] == ["snapshot", "update"]
+        assert changes[1] == {
+            "topic": "matter_status", "id": 7, "type": "update", "value": "Closed", "previous": "Open"
+        }
+
+def test_failing_subscriber_is_dropped():
+    async def fetch(case_id):
+        return [{"EventTypeID": 1}]
+
+    async def run():
+        feed = ChangeFeed({"case_events": fetch}, interval=3600)
+
+        async def broken(change):
+            raise ConnectionError("session closed")
+
+        await feed.subscribe(("case_events", 1), "broken", broken)
+        await feed.poll_once()
+        return feed.topics
+
+    assert asyncio.run(run()) == []
+
+def test_subscription_receives_changes():
+    async def fetch(case_id):
+        return [{"EventTypeID": 1}]
+
+    async def run():
+        feed = ChangeFeed({"case_events": fetch}, interval=3600)
+        async with Subscription(feed, [("case_events", 5)]) as subscription:
+            await feed.poll_once()
+            change = await subscription.get(timeout=1)
+        assert feed.topics == []
+        return change
+
+    change = asyncio.run(run())
+    assert change == {"topic": "case_events", "id": 5, "type": "snapshot", "value": [{"EventTypeID": 1}]}
+
+def test_stop_cancels_watcher():
+    async def fetch(case_id):
+        return []
+
+    async def noop(change):
+        pass
+
+    async def run():
+        feed = ChangeFeed({"case_events": fetch}, interval=3600)
+        await feed.subscribe(("case_events", 1), "key", noop)
+        task = feed._task
+        await feed.stop()
+        await feed.stop()
+        return task
+
+    assert asyncio.run(run()).cancelled()
+
+def test_topic_for_uri():
+    assert server._topic_for_uri("aquarium://matters/12/status") == (server.MATTER_STATUS, 12)
+    assert server._topic_for_uri("aquarium://cases/34/events") == (server.CASE_EVENTS, 34)
+    assert server._topic_for_uri("aquarium://cases/34/status") is None
+
+def test_mcp_subscription_notifies_session(monkeypatch):
+    notified = []
+
+    class Session:
+        async def send_resource_updated(self, uri):
+            notified.append(uri)
+
+    session = Session()
+    monkeypatch.setattr(
+        server.mcp._mcp_server, "request_context", types.SimpleNamespace(session=session), raising=False
+    )
+    client = type("C", (), {"get_case_status_by_matter_id": lambda self, matter_id: "Open"})()
+    monkeypatch.setattr(server, "aquarium_client", client)
+    feed = ChangeFeed(server.change_feed.fetchers, interval=3600)
+    monkeypatch.setattr(server, "change_feed", feed)
+
+    async def run():
+        await server.subscribe_resource("aquarium://matters/9/status")
+        await feed.poll_once()
+        await server.unsubscribe_resource("aquarium://matters/9/status")
+
+    asyncio.run(run())
+    assert notified == ["aquarium://matters/9/status"]
+    assert feed.topics == []
+
+def test_disconnected_session_is_released(monkeypatch):
+    session = types.SimpleNamespace(send_resource_updated=None)
+    monkeypatch.setattr(
+        server.mcp._mcp_server, "request_context", types.SimpleNamespace(session=session), raising=False
+    )
+    feed = ChangeFeed(server.change_feed.fetchers, interval=3600)
+    monkeypatch.setattr(server, "change_feed", feed)
+
+    async def subscribe(client_key, uri):
+        server.current_client.set(server.ClientIdentity(client_key, server.INTERACTIVE))
+        await server.subscribe_resource(uri)
+
+    async def run():
+        await subscribe("mcp:gone", "aquarium://matters/1/status")
+        await subscribe("mcp:gone", "aquarium://cases/2/events")
+        await subscribe("mcp:other", "aquarium://cases/2/events")
+        feed._task.cancel()
+        server.release_session_subscriptions("mcp:gone")
+
+    asyncio.run(run())
+    assert feed.topics == [(server.CASE_EVENTS, 2)]
+
+def test_resource_read_uses_snapshot(monkeypatch):
+    calls = []
+
+    def status(self, matter_id):
+        calls.append(matter_id)
+        return "Open"
+
+    client = type("C", (), {"get_case_status_by_matter_id": status})()
+    monkeypatch.setattr(server, "aquarium_client", client)
+    feed = ChangeFeed(server.change_feed.fetchers, interval=3600)
+    monkeypatch.setattr(server, "change_feed", feed)
+
+    async def noop(change):
+        pass
+
+    async def run():
+        first = await server.matter_status_resource("3")
+        await feed.subscribe((server.MATTER_STATUS, 3), "watcher", noop)
+        feed._task.cancel()
+        await feed.poll_once()
+        second = await server.matter_status_resource("3")
+        feed.unsubscribe((server.MATTER_STATUS, 3), "watcher")
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first == second == '{"matter_id": 3, "status": "Open"}'
+    assert len(calls) == 2
+
+def test_resource_read_keeps_reader_identity(monkeypatch):
+    client = type("C", (), {"get_event_history": lambda self, case_id: []})()
+    monkeypatch.setattr(server, "aquarium_client", client)
+
+    async def run():
+        reader = server.ClientIdentity("mcp:reader", server.INTERACTIVE)
+        server.current_client.set(reader)
+        await server.case_events_resource("4")
+        return server.current_client.get() is reader
+
+    assert asyncio.run(run())
+
+def test_watch_route_requires_topics():
+    response = TestClient(main_module.app).get("/aquarium/watch")
+    assert response.status_code == 400
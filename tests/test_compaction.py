@@ -0,0 +1,79 @@
+import asyncio
+import json
+import logging
+
+import src.aq_mcp_server as server
+from src.helpers.compaction import compact_result, payload_size
+
+
+def test_compact_drops_nulls_and_empties():
+    result = compact_result("unknown_tool", {"a": 1, "b": None, "c": "", "d": [], "e": {"f": None}}, 0)
+    assert result == {"a": 1}
+
+def test_compact_applies_whitelist():
+    record = {"CaseID": 1, "LeadID": 2, "InternalNoise": "x" * 100}
+    result = compact_result("get_first_case_by_lead_id", record, 0)
+    assert result == {"CaseID": 1, "LeadID": 2}
+
+def test_compact_whitelist_passthrough_for_unknown_shape():
+    record = {"case_id": 1}
+    assert compact_result("get_first_case_by_lead_id", record, 0) == record
+
+def test_compact_tabular_is_columnar():
+    rows = [{"lead": 1, "case": 2, "matter": 3}, {"lead": 4, "case": 5, "matter": None}]
+    result = compact_result("get_leads_cases_matters_ids_by_customer_id", rows, 0)
+    assert result == {"columns": ["lead", "case", "matter"], "rows": [[1, 2, 3], [4, 5, None]]}
+
+def test_compact_truncates_with_marker():
+    rows = [{"EventTypeID": i} for i in range(5)]
+    result = compact_result("get_event_history", rows, 2)
+    assert result["rows"] == [[0], [1]]
+    assert result["more_available"] == 3
+
+    cases = [{"CaseID": i} for i in range(5)]
+    result = compact_result("get_cases_by_lead_id", cases, 2)
+    assert result == [{"CaseID": 0}, {"CaseID": 1}, {"more_available": 3}]
+
+def test_compact_shrinks_payload():
+    rows = [{"CaseID": i, "Extra": None, "Blob": "x" * 50} for i in range(10)]
+    assert payload_size(compact_result("get_cases_by_email", rows, 0)) < payload_size(rows)
+
+def test_compact_reports_sizes_at_info(caplog):
+    rows = [{"CaseID": i, "Extra": None} for i in range(3)]
+    with caplog.at_level(logging.INFO, logger="src.helpers.compaction"):
+        compact_result("get_cases_by_email", rows, 0)
+    assert "Compacted get_cases_by_email result" in caplog.text
+
+def test_compact_leaves_strings_untouched():
+    assert compact_result("get_event_history", "No event history", 0) == "No event history"
+
+def test_tool_compaction_enabled(monkeypatch):
+    rows = [{"lead": 1, "case": 2, "matter": 3}]
+    client = type("C", (), {"get_leads_cases_matters_ids_by_customer_id": lambda self, *a: rows})()
+    monkeypatch.setattr(server, "aquarium_client", client)
+    monkeypatch.setattr(server.config, "COMPACT_TOOL_RESULTS", True)
+    tool = server.mcp_tools["get_leads_cases_matters_ids_by_customer_id"]
+    result = asyncio.run(tool("cust1"))
+    assert json.loads(result) == {"columns": ["lead", "case", "matter"], "rows": [[1, 2, 3]]}
+
+def test_rest_wrappers_are_not_compacted(monkeypatch):
+    rows = [{"lead": 1, "case": 2, "matter": 3}]
+    client = type("C", (), {"get_leads_cases_matters_ids_by_customer_id": lambda self, *a: rows})()
+    monkeypatch.setattr(server, "aquarium_client", client)
+    monkeypatch.setattr(server.config, "COMPACT_TOOL_RESULTS", True)
+    assert asyncio.run(server.leads_cases_matters_route("cust1")) == rows
+
+def test_spilled_result_preview_is_compacted(monkeypatch):
+    monkeypatch.setattr(server.config, "COMPACT_TOOL_RESULTS", True)
+    spilled = {"truncated": True, "resource_uri": "aquarium://results/x", "preview": [{"CaseID": 1, "Noise": None}]}
+    result = server._compact("get_cases_by_email", spilled)
+    assert result["preview"] == [{"CaseID": 1}]
+    assert result["resource_uri"] == "aquarium://results/x"
+
+def test_tool_compaction_disabled_by_default(monkeypatch):
+    rows = [{"lead": 1, "case": 2, "matter": 3}]
+    client = type("C", (), {"get_leads_cases_matters_ids_by_customer_id": lambda self, *a: rows})()
+    monkeypatch.setattr(server, "aquarium_client", client)
+    monkeypatch.setattr(server.config, "COMPACT_TOOL_RESULTS", False)
+    tool = server.mcp_tools["get_leads_cases_matters_ids_by_customer_id"]
+    assert [json.loads(row) for row in asyncio.run(tool("cust1"))] == rows
@@ -0,0 +1,56 @@
+from fastapi.testclient import TestClient
+
+import src.aq_mcp_server as server
+import src.main as main_module
+from src.helpers.http_cache import CACHE_POLICIES, etag_matches, make_etag
+
+client = TestClient(main_module.app)
+
+
+def stub_client(monkeypatch, events):
+    aq = type("C", (), {"get_event_history": lambda self, case_id: events})()
+    monkeypatch.setattr(server, "aquarium_client", aq)
+
+def test_etag_matches():
+    etag = make_etag(b"{}")
+    assert etag.startswith('W/"')
+    assert etag_matches(etag, etag)
+    assert etag_matches(etag.removeprefix("W/"), etag)
+    assert etag_matches('"other", ' + etag, etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"other"', etag)
+    assert not etag_matches(None, etag)
+
+def test_route_sets_validators(monkeypatch):
+    stub_client(monkeypatch, [{"EventTypeID": 1}])
+    response = client.get("/aquarium/event-history/1")
+    assert response.status_code == 200
+    assert response.headers["ETag"] == make_etag(response.content)
+    assert response.headers["Cache-Control"] == f"private, max-age={CACHE_POLICIES['get_event_history']}"
+
+def test_conditional_get_returns_304(monkeypatch):
+    stub_client(monkeypatch, [{"EventTypeID": 1}])
+    etag = client.get("/aquarium/event-history/2").headers["ETag"]
+    response = client.get("/aquarium/event-history/2", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+
+def test_changed_payload_returns_200(monkeypatch):
+    stub_client(monkeypatch, [{"EventTypeID": 1}])
+    etag = client.get("/aquarium/event-history/3").headers["ETag"]
+    stub_client(monkeypatch, [{"EventTypeID": 1}, {"EventTypeID": 2}])
+    response = client.get("/aquarium/event-history/3", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+def test_large_responses_are_compressed(monkeypatch):
+    stub_client(monkeypatch, [{"EventTypeID": i, "Comments": "x" * 50} for i in range(100)])
+    response = client.get("/aquarium/event-history/4", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert len(response.json()) == 100
+
+def test_small_responses_are_not_compressed(monkeypatch):
+    stub_client(monkeypatch, [{"EventTypeID": 1}])
+    response = client.get("/aquarium/event-history/5", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in response.headers
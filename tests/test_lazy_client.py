@@ -0,0 +1,51 @@
+import asyncio
+
+import src.aq_mcp_server as server
+from src.helpers.lazy_client import LazyClient
+
+
+class CountingFactory:
+    def __init__(self):
+        self.calls = 0
+    def __call__(self):
+        self.calls += 1
+        return type("C", (), {"ping": lambda self: "pong"})()
+
+def test_import_does_not_construct_client():
+    assert isinstance(server.aquarium_client, LazyClient)
+    assert not server.aquarium_client.initialized
+
+def test_lazy_client_constructs_once_on_first_use():
+    factory = CountingFactory()
+    client = LazyClient(factory)
+    assert factory.calls == 0
+    assert not client.initialized
+    assert client.ping() == "pong"
+    assert client.ping() == "pong"
+    assert factory.calls == 1
+    assert client.initialized
+
+def test_lazy_client_async_get():
+    factory = CountingFactory()
+    client = LazyClient(factory)
+    instance = asyncio.run(client.aget())
+    assert instance.ping() == "pong"
+    assert asyncio.run(client.aget()) is instance
+    assert factory.calls == 1
+
+def test_tools_use_lazy_client(monkeypatch):
+    factory = lambda: type("C", (), {"get_case_status_by_matter_id": lambda self, m: "Open"})()
+    monkeypatch.setattr(server, "aquarium_client", LazyClient(factory))
+    assert asyncio.run(server.get_case_status_by_matter_id(1)) == "Open"
+
+def test_warm_up_client(monkeypatch):
+    factory = CountingFactory()
+    monkeypatch.setattr(server, "aquarium_client", LazyClient(factory))
+    asyncio.run(server.warm_up_client())
+    assert factory.calls == 1
+
+def test_warm_up_client_swallows_errors(monkeypatch):
+    def failing():
+        raise RuntimeError("WSDL unavailable")
+    monkeypatch.setattr(server, "aquarium_client", LazyClient(failing))
+    asyncio.run(server.warm_up_client())
@@ -0,0 +1,104 @@
+import asyncio
+import threading
+import time
+
+from fastapi.testclient import TestClient
+
+import src.aq_mcp_server as server
+import src.main as main_module
+from src.helpers.profiling import SamplingProfiler, SlowCallLog, phase
+
+client = TestClient(main_module.app)
+
+
+def busy_worker(stop):
+    while not stop.is_set():
+        sum(range(1000))
+
+def test_sampling_profiler_collects_folded_stacks():
+    stop = threading.Event()
+    worker = threading.Thread(target=busy_worker, args=(stop,), name="worker")
+    worker.start()
+    profiler = SamplingProfiler(interval=0.001)
+    profiler.start()
+    time.sleep(0.05)
+    profiler.stop()
+    stop.set()
+    worker.join()
+    folded = profiler.folded()
+    assert profiler.samples > 0
+    assert any(line.startswith("worker;") and "busy_worker" in line for line in folded.splitlines())
+    assert folded.splitlines()[0].rsplit(" ", 1)[1].isdigit()
+
+def test_slow_call_log_records_phases():
+    log = SlowCallLog(threshold=0, maxlen=2)
+
+    @log.capture
+    async def tool(case_id: int):
+        with phase("upstream"):
+            await asyncio.sleep(0.01)
+        return case_id
+
+    for case_id in range(3):
+        assert asyncio.run(tool(case_id)) == case_id
+    entries = log.entries()
+    assert len(entries) == 2
+    assert entries[0]["tool"] == "tool"
+    assert entries[0]["arguments"] == {"case_id": "2"}
+    assert entries[0]["phases"]["upstream"] >= 0.01
+    assert entries[0]["slowest_phase"] == "upstream"
+    assert 0 < len(entries[0]["stack"]) <= 12
+    assert entries[0]["stack"][-1].endswith(" tool")
+
+def test_fast_calls_are_not_recorded():
+    log = SlowCallLog(threshold=60)
+
+    @log.capture
+    async def tool():
+        return 1
+
+    asyncio.run(tool())
+    assert log.entries() == []
+
+def test_tool_calls_are_captured(monkeypatch):
+    aq = type("C", (), {"get_case_status_by_matter_id": lambda self, matter_id: "Open"})()
+    monkeypatch.setattr(server, "aquarium_client", aq)
+    monkeypatch.setattr(server.slow_calls, "threshold", 0)
+    server.slow_calls.clear()
+    asyncio.run(server.get_case_status_by_matter_id(7))
+    entry = server.slow_calls.entries()[0]
+    assert entry["tool"] == "get_case_status_by_matter_id"
+    assert set(entry["phases"]) >= {"queue", "upstream"}
+
+def test_mcp_tool_calls_include_compaction_and_encoding(monkeypatch):
+    aq = type("C", (), {"get_case_status_by_matter_id": lambda self, matter_id: "Open"})()
+    monkeypatch.setattr(server, "aquarium_client", aq)
+    monkeypatch.setattr(server.slow_calls, "threshold", 0)
+    server.slow_calls.clear()
+    asyncio.run(server.mcp_tools["get_case_status_by_matter_id"](7))
+    entries = server.slow_calls.entries()
+    assert len(entries) == 1
+    assert set(entries[0]["phases"]) >= {"queue", "upstream", "compact", "encode"}
+
+def test_admin_routes_hidden_without_token(monkeypatch):
+    monkeypatch.setattr(server.config, "ADMIN_TOKEN", "")
+    assert client.get("/admin/slow-calls", headers={"X-Admin-Token": "x"}).status_code == 404
+
+def test_admin_routes_require_token(monkeypatch):
+    monkeypatch.setattr(server.config, "ADMIN_TOKEN", "secret")
+    assert client.get("/admin/slow-calls").status_code == 403
+    assert client.get("/admin/slow-calls", headers={"X-Admin-Token": "wrong"}).status_code == 403
+    response = client.get("/admin/slow-calls", headers={"X-Admin-Token": "secret"})
+    assert response.status_code == 200
+    assert "calls" in response.json()
+
+def test_admin_profiler_lifecycle(monkeypatch):
+    monkeypatch.setattr(server.config, "ADMIN_TOKEN", "secret")
+    headers = {"X-Admin-Token": "secret"}
+    assert client.post("/admin/profiler/start", headers=headers).json()["status"] == "started"
+    assert client.post("/admin/profiler/start", headers=headers).status_code == 409
+    time.sleep(0.02)
+    assert client.post("/admin/profiler/stop", headers=headers).json()["status"] == "stopped"
+    response = client.get("/admin/profiler/profile", headers=headers)
+    assert response.status_code == 200
+    assert "profile.folded" in response.headers["Content-Disposition"]
@@ -0,0 +1,115 @@
+import asyncio
+import threading
+import time
+import types
+
+import pytest
+
+import src.aq_mcp_server as server
+from src.helpers.async_client import AsyncAquariumClient
+from src.helpers.rate_limit import RateLimiter, RateLimitExceeded
+
+
+class FamilyClient:
+    """Three customers share one email; each case lookup takes `delay` seconds."""
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.calls = []
+        self.lock = threading.Lock()
+    def _record(self, name):
+        with self.lock:
+            self.calls.append(name)
+    def get_customers_by_email(self, email):
+        self._record("get_customers_by_email")
+        return [types.SimpleNamespace(CustomerID=i) for i in (1, 2, 3)]
+    def get_cases_by_customer_id(self, customer_id):
+        self._record("get_cases_by_customer_id")
+        time.sleep(self.delay)
+        return [types.SimpleNamespace(CaseID=customer_id * 10)]
+    def get_first_case_by_customer_id(self, customer_id):
+        self._record("get_first_case_by_customer_id")
+        time.sleep(self.delay * customer_id)
+        return types.SimpleNamespace(CaseID=customer_id * 10) if customer_id > 1 else None
+
+def test_cases_by_email_fetches_customers_concurrently(monkeypatch):
+    sync_client = FamilyClient()
+    monkeypatch.setattr(server, "aquarium_client", AsyncAquariumClient(sync_client))
+    started = time.perf_counter()
+    result = asyncio.run(server.get_cases_by_email("family@example.com"))
+    elapsed = time.perf_counter() - started
+    assert result == [{"CaseID": 10}, {"CaseID": 20}, {"CaseID": 30}]
+    assert elapsed < 3 * sync_client.delay
+
+def test_customer_resolution_is_reused(monkeypatch):
+    sync_client = FamilyClient(delay=0)
+    monkeypatch.setattr(server, "aquarium_client", sync_client)
+    asyncio.run(server.get_customers_by_email("Family@example.com"))
+    asyncio.run(server.get_cases_by_email("family@example.com"))
+    assert sync_client.calls.count("get_customers_by_email") == 1
+
+class ReversedFamilyClient(FamilyClient):
+    """Every customer has a case, but earlier customers answer more slowly."""
+
+    def get_first_case_by_customer_id(self, customer_id):
+        self._record("get_first_case_by_customer_id")
+        time.sleep({1: self.delay * 2, 2: 0, 3: self.delay * 20}[customer_id])
+        return types.SimpleNamespace(CaseID=customer_id * 10)
+
+def test_first_case_by_email_skips_customers_without_cases(monkeypatch):
+    sync_client = FamilyClient(delay=0.05)
+    monkeypatch.setattr(server, "aquarium_client", AsyncAquariumClient(sync_client))
+    result = asyncio.run(server.get_first_case_by_email("family@example.com"))
+    assert result == {"CaseID": 20}
+
+def test_first_case_by_email_follows_customer_order(monkeypatch):
+    sync_client = ReversedFamilyClient(delay=0.05)
+    monkeypatch.setattr(server, "aquarium_client", AsyncAquariumClient(sync_client))
+
+    async def run():
+        started = time.perf_counter()
+        result = await server.get_first_case_by_email("family@example.com")
+        return result, time.perf_counter() - started
+
+    result, elapsed = asyncio.run(run())
+    assert result == {"CaseID": 10}
+    assert elapsed < 10 * sync_client.delay
+
+def test_failed_lookup_cancels_siblings(monkeypatch):
+    class FailingFamilyClient(FamilyClient):
+        def get_cases_by_customer_id(self, customer_id):
+            if customer_id == 1:
+                raise ValueError("upstream fault")
+            time.sleep(1)
+            return []
+
+    monkeypatch.setattr(server, "aquarium_client", AsyncAquariumClient(FailingFamilyClient()))
+
+    async def run():
+        started = time.perf_counter()
+        with pytest.raises(ValueError):
+            await server.get_cases_by_email("family@example.com")
+        return time.perf_counter() - started
+
+    assert asyncio.run(run()) < 0.5
+
+def test_planned_tool_call_is_charged_once(monkeypatch):
+    monkeypatch.setattr(server, "aquarium_client", FamilyClient(delay=0))
+    monkeypatch.setattr(server, "rate_limiter", RateLimiter(rate=0.001, burst=1))
+    assert len(asyncio.run(server.get_cases_by_email("family@example.com"))) == 3
+    with pytest.raises(RateLimitExceeded) as info:
+        asyncio.run(server.get_cases_by_email("family@example.com"))
+    assert info.value.tool == "get_cases_by_email"
+
+def test_first_case_by_email_none(monkeypatch):
+    client = type("C", (), {"get_customers_by_email": lambda self, email: []})()
+    monkeypatch.setattr(server, "aquarium_client", client)
+    assert asyncio.run(server.get_first_case_by_email("x@y.com")) == "No cases found for email: x@y.com"
+
+def test_cases_by_email_falls_back_without_customer_ids(monkeypatch):
+    client = type("C", (), {
+        "get_customers_by_email": lambda self, email: [types.SimpleNamespace(name="no id")],
+        "get_cases_by_email": lambda self, email: [types.SimpleNamespace(CaseID=5)],
+    })()
+    monkeypatch.setattr(server, "aquarium_client", client)
+    assert asyncio.run(server.get_cases_by_email("x@y.com")) == [{"CaseID": 5}]
@@ -0,0 +1,131 @@
+import asyncio
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+import src.aq_mcp_server as server
+import src.main as main_module
+from src.helpers.rate_limit import (
+    BATCH,
+    INTERACTIVE,
+    ClientIdentity,
+    FairScheduler,
+    RateLimiter,
+    RateLimitExceeded,
+    TokenBucket,
+    parse_tool_rates,
+)
+
+
+def test_token_bucket_refills():
+    bucket = TokenBucket(rate=2, capacity=1)
+    assert bucket.acquire(now=bucket.updated) == 0.0
+    assert bucket.acquire(now=bucket.updated) == pytest.approx(0.5)
+    assert bucket.acquire(now=bucket.updated + 0.5) == 0.0
+
+def test_rate_limiter_is_per_client_and_tool():
+    limiter = RateLimiter(rate=0.001, burst=1)
+    limiter.check("a", "get_event_history")
+    limiter.check("b", "get_event_history")
+    limiter.check("a", "get_customers_by_email")
+    with pytest.raises(RateLimitExceeded) as info:
+        limiter.check("a", "get_event_history")
+    payload = json.loads(str(info.value))
+    assert payload["error"] == "rate_limited"
+    assert payload["tool"] == "get_event_history"
+    assert payload["retry_after"] > 0
+
+def test_rate_limiter_tool_override():
+    limiter = RateLimiter(rate=100, burst=1, tool_rates=parse_tool_rates("get_event_history=0.001"))
+    limiter.check("a", "get_event_history")
+    with pytest.raises(RateLimitExceeded):
+        limiter.check("a", "get_event_history")
+
+def test_parse_tool_rates():
+    assert parse_tool_rates(" a=1, b=0.5 ,") == {"a": 1.0, "b": 0.5}
+
+def test_fair_scheduler_prefers_interactive():
+    order = []
+
+    async def run():
+        scheduler = FairScheduler(max_concurrency=1)
+        await scheduler.acquire(ClientIdentity("holder"))
+
+        async def call(identity, label):
+            await scheduler.acquire(identity)
+            order.append(label)
+            scheduler.release()
+
+        tasks = [asyncio.create_task(call(ClientIdentity("job", BATCH), f"batch{i}")) for i in range(3)]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(call(ClientIdentity("user", INTERACTIVE), "interactive")))
+        await asyncio.sleep(0)
+        assert scheduler.queued == 4
+        scheduler.release()
+        await asyncio.gather(*tasks)
+        assert scheduler.active == 0
+
+    asyncio.run(run())
+    assert order.index("interactive") < order.index("batch1")
+
+def test_fair_scheduler_bounds_concurrency():
+    peak = 0
+
+    async def run():
+        nonlocal peak
+        scheduler = FairScheduler(max_concurrency=2)
+
+        async def call():
+            nonlocal peak
+            async with scheduler:
+                peak = max(peak, scheduler.active)
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(*(call() for _ in range(6)))
+
+    asyncio.run(run())
+    assert peak == 2
+
+def test_tool_raises_when_rate_limited(monkeypatch):
+    client = type("C", (), {"get_event_history": lambda self, case_id: []})()
+    monkeypatch.setattr(server, "aquarium_client", client)
+    monkeypatch.setattr(server, "rate_limiter", RateLimiter(rate=0.001, burst=1))
+    asyncio.run(server.get_event_history(1))
+    with pytest.raises(RateLimitExceeded):
+        asyncio.run(server.get_event_history(1))
+
+def test_rest_route_returns_429(monkeypatch):
+    client = type("C", (), {"get_event_history": lambda self, case_id: [{"EventTypeID": 1}]})()
+    monkeypatch.setattr(server, "aquarium_client", client)
+    monkeypatch.setattr(server, "rate_limiter", RateLimiter(rate=0.001, burst=1))
+    monkeypatch.setattr(server.config, "API_KEYS", "k1,k2")
+    http = TestClient(main_module.app)
+    assert http.get("/aquarium/event-history/1", headers={"X-API-Key": "k1"}).status_code == 200
+    response = http.get("/aquarium/event-history/1", headers={"X-API-Key": "k1"})
+    assert response.status_code == 429
+    assert response.json()["error"] == "rate_limited"
+    assert int(response.headers["Retry-After"]) >= 1
+    assert http.get("/aquarium/event-history/1", headers={"X-API-Key": "k2"}).status_code == 200
+
+def test_unknown_api_keys_share_the_address_bucket(monkeypatch):
+    client = type("C", (), {"get_event_history": lambda self, case_id: [{"EventTypeID": 1}]})()
+    monkeypatch.setattr(server, "aquarium_client", client)
+    monkeypatch.setattr(server, "rate_limiter", RateLimiter(rate=0.001, burst=1))
+    monkeypatch.setattr(server.config, "API_KEYS", "k1")
+    http = TestClient(main_module.app)
+    assert http.get("/aquarium/event-history/1", headers={"X-API-Key": "made-up-1"}).status_code == 200
+    assert http.get("/aquarium/event-history/1", headers={"X-API-Key": "made-up-2"}).status_code == 429
+    assert http.get("/aquarium/event-history/1", headers={"X-API-Key": "k1"}).status_code == 200
+
+def test_forwarded_for_only_trusted_from_proxies(monkeypatch):
+    client = type("C", (), {"get_event_history": lambda self, case_id: [{"EventTypeID": 1}]})()
+    monkeypatch.setattr(server, "aquarium_client", client)
+    monkeypatch.setattr(server, "rate_limiter", RateLimiter(rate=0.001, burst=1))
+    http = TestClient(main_module.app)
+    spoofed = {"X-Forwarded-For": "10.0.0.1"}
+    assert http.get("/aquarium/event-history/1", headers=spoofed).status_code == 200
+    assert http.get("/aquarium/event-history/1", headers={"X-Forwarded-For": "10.0.0.2"}).status_code == 429
+    monkeypatch.setattr(server.config, "TRUSTED_PROXIES", "testclient")
+    assert http.get("/aquarium/event-history/1", headers={"X-Forwarded-For": "10.0.0.3"}).status_code == 200
+    assert http.get("/aquarium/event-history/1", headers={"X-Forwarded-For": "10.0.0.3"}).status_code == 429
@@ -0,0 +1,175 @@
+import asyncio
+import json
+import time
+import types
+
+import pytest
+from fastapi.testclient import TestClient
+
+import src.aq_mcp_server as server
+import src.main as main_module
+from src.helpers.async_client import AsyncAquariumClient
+from src.helpers.lazy_client import LazyClient
+from src.helpers.replay import ReplayClient, ReplayMiss, ReplayStore, track_fallbacks
+
+
+class FlakyClient:
+    def __init__(self):
+        self.down = False
+        self.calls = 0
+    def get_event_history(self, case_id):
+        self.calls += 1
+        if self.down:
+            raise ConnectionError("Aquarium unavailable")
+        return [types.SimpleNamespace(EventTypeID=case_id)]
+    def get_case_status_by_matter_id(self, matter_id):
+        time.sleep(0.2)
+        return "Open"
+    def get_unpicklable(self):
+        return lambda: None
+
+@pytest.fixture
+def store(tmp_path):
+    store = ReplayStore(str(tmp_path / "replay.sqlite3"))
+    yield store
+    store.close()
+
+def test_record_then_replay(store):
+    upstream = FlakyClient()
+    recorder = ReplayClient(upstream, store, mode="record")
+    recorded = asyncio.run(recorder.get_event_history(1))
+    assert len(store) == 1
+
+    replayer = ReplayClient(None, store, mode="replay")
+    replayed = asyncio.run(replayer.get_event_history(1))
+    assert vars(replayed[0]) == vars(recorded[0])
+    assert upstream.calls == 1
+
+def test_replay_miss(store):
+    replayer = ReplayClient(None, store, mode="replay")
+    with pytest.raises(ReplayMiss):
+        asyncio.run(replayer.get_event_history(2))
+
+def test_replay_emulates_latency(store):
+    store.put("get_event_history", (3,), {}, [], 0.05)
+    replayer = ReplayClient(None, store, mode="replay", latency_scale=1)
+    started = time.perf_counter()
+    asyncio.run(replayer.get_event_history(3))
+    assert time.perf_counter() - started >= 0.05
+
+def test_last_known_good_fallback(store):
+    upstream = FlakyClient()
+    recorder = ReplayClient(upstream, store, mode="record")
+    asyncio.run(recorder.get_event_history(4))
+    upstream.down = True
+    assert asyncio.run(recorder.get_event_history(4))[0].EventTypeID == 4
+    with pytest.raises(ConnectionError):
+        asyncio.run(recorder.get_event_history(5))
+
+def test_fallback_when_client_cannot_be_built(store):
+    store.put("get_event_history", (6,), {}, ["cached"], 0.01)
+    def failing():
+        raise ConnectionError("WSDL unavailable")
+    recorder = ReplayClient(LazyClient(failing), store, mode="record")
+    assert asyncio.run(recorder.get_event_history(6)) == ["cached"]
+
+def test_unpicklable_responses_are_not_recorded(store):
+    recorder = ReplayClient(FlakyClient(), store, mode="record")
+    assert callable(asyncio.run(recorder.get_unpicklable()))
+    assert len(store) == 0
+
+def test_replay_mode_does_not_build_upstream(monkeypatch, tmp_path):
+    monkeypatch.setattr(server.config, "AQUARIUM_REPLAY_MODE", "replay")
+    monkeypatch.setattr(server.config, "AQUARIUM_REPLAY_PATH", str(tmp_path / "replay.sqlite3"))
+    monkeypatch.setattr(server, "AquariumClient", lambda: pytest.fail("upstream client built"))
+    client = server._build_client()
+    assert isinstance(client, ReplayClient)
+    monkeypatch.setattr(server, "aquarium_client", client)
+    response = TestClient(main_module.app).get("/aquarium/event-history/1")
+    assert response.status_code == 503
+    assert response.json()["error"] == "replay_miss"
+    client.store.close()
+
+def test_fallback_is_reported_as_stale(store):
+    upstream = FlakyClient()
+    recorder = ReplayClient(upstream, store, mode="record")
+    asyncio.run(recorder.get_event_history(7))
+    upstream.down = True
+
+    async def run():
+        with track_fallbacks() as marker:
+            await recorder.get_event_history(7)
+        return marker
+
+    marker = asyncio.run(run())
+    assert marker.stale
+    assert marker.to_dict()["recorded_at"].endswith("+00:00")
+
+def test_fallback_mode_refreshes_at_most_once_per_interval(store, monkeypatch):
+    writes = []
+    put = store.put
+    monkeypatch.setattr(store, "put", lambda *args: writes.append(args[0]) or put(*args))
+    recorder = ReplayClient(FlakyClient(), store, mode="fallback", refresh_interval=3600)
+    for _ in range(3):
+        asyncio.run(recorder.get_event_history(8))
+    asyncio.run(recorder.get_event_history(9))
+    assert writes == ["get_event_history", "get_event_history"]
+
+def test_store_retention(tmp_path):
+    store = ReplayStore(str(tmp_path / "replay.sqlite3"), max_age=60, max_rows=2)
+    for case_id in range(3):
+        store.put("get_event_history", (case_id,), {}, [], 0.01)
+    store.prune()
+    assert len(store) == 2
+    with store._connection:
+        store._connection.execute("UPDATE responses SET recorded_at = 0")
+    assert store.get("get_event_history", (2,), {}) is None
+    assert store.prune() == 2
+    store.close()
+
+def stale_client(store):
+    store.put("get_event_history", (1,), {}, [types.SimpleNamespace(EventTypeID=1)], 0.01)
+    upstream = FlakyClient()
+    upstream.down = True
+    return ReplayClient(upstream, store, mode="fallback")
+
+def test_mcp_tool_marks_stale_result(store, monkeypatch):
+    monkeypatch.setattr(server, "aquarium_client", stale_client(store))
+    result = json.loads(asyncio.run(server.mcp_tools["get_event_history"](1)))
+    assert result["stale"] is True
+    assert result["recorded_at"]
+    assert result["result"] == [{"EventTypeID": 1}]
+
+def test_rest_route_flags_stale_response(store, monkeypatch):
+    monkeypatch.setattr(server, "aquarium_client", stale_client(store))
+    response = TestClient(main_module.app).get("/aquarium/event-history/1")
+    assert response.status_code == 200
+    assert response.json() == [{"EventTypeID": 1}]
+    assert response.headers["warning"].startswith("110")
+    assert response.headers["cache-control"] == "no-store"
+    assert "x-aquarium-recorded-at" in response.headers
+
+def test_fallback_after_timeout_holds_scheduler_slot(store, monkeypatch):
+    store.put("get_case_status_by_matter_id", (7,), {}, "Closed", 0.01)
+    upstream = AsyncAquariumClient(FlakyClient(), timeout=0.01)
+    monkeypatch.setattr(server, "aquarium_client", ReplayClient(upstream, store, mode="fallback"))
+    scheduler = server.FairScheduler(max_concurrency=1)
+    monkeypatch.setattr(server, "upstream_scheduler", scheduler)
+
+    async def run():
+        status = await server.get_case_status_by_matter_id(7)
+        held = scheduler.active
+        await asyncio.sleep(0.4)
+        return status, held, scheduler.active
+
+    assert asyncio.run(run()) == ("Closed", 1, 0)
+
+def test_fallback_customer_resolution_is_not_cached(store, monkeypatch):
+    store.put("get_customers_by_email", ("a@example.com",), {}, [types.SimpleNamespace(CustomerID=5)], 0.01)
+    # The upstream has no such method, so every call falls back to the store.
+    monkeypatch.setattr(server, "aquarium_client", ReplayClient(types.SimpleNamespace(), store, mode="fallback"))
+    for _ in range(2):
+        result = json.loads(asyncio.run(server.mcp_tools["get_customers_by_email"]("a@example.com")))
+        assert result["stale"] is True
+        assert result["result"] == [{"CustomerID": 5}]
+    assert server._customer_resolutions == {}
@@ -0,0 +1,86 @@
+from src.helpers.schema_cache import CACHE_FORMAT_VERSION, SchemaCache
+
+
+class Session:
+    def __init__(self, secret):
+        self.cookies = {"session_key": secret}
+    def mount(self, prefix, adapter):
+        pass
+
+class Document:
+    def __init__(self, marker, session=None):
+        self.marker = marker
+        self.session = session
+
+class FakeClient:
+    def __init__(self, wsdl, secret="s3cret"):
+        self.session = Session(secret)
+        self.wsdl = wsdl
+
+def make_build(calls, marker="parsed"):
+    def build(schema):
+        calls.append(schema.marker if schema is not None else None)
+        return FakeClient(schema or Document(marker, Session("s3cret")))
+    return build
+
+def extract(client):
+    return client.wsdl
+
+def make_cache(tmp_path, content="<definitions/>"):
+    wsdl = tmp_path / "service.wsdl"
+    wsdl.write_text(content)
+    return SchemaCache(str(tmp_path / "cache"), str(wsdl)), wsdl
+
+def test_cache_hit_reuses_schema_with_fresh_client(tmp_path):
+    cache, wsdl = make_cache(tmp_path)
+    calls = []
+    first = cache.load_or_build(make_build(calls), extract)
+    restarted = SchemaCache(str(tmp_path / "cache"), str(wsdl))
+    second = restarted.load_or_build(make_build(calls, "reparsed"), extract)
+    assert calls == [None, "parsed"]
+    assert second.wsdl.marker == "parsed"
+    assert second is not first
+
+def test_credentials_are_not_written_to_disk(tmp_path):
+    cache, _ = make_cache(tmp_path)
+    cache.load_or_build(make_build([]), extract)
+    (entry,) = cache.directory.glob("*.pkl")
+    assert b"s3cret" not in entry.read_bytes()
+    assert cache.load_or_build(make_build([]), extract).wsdl.session is None
+
+def test_changed_wsdl_invalidates_entry(tmp_path):
+    cache, wsdl = make_cache(tmp_path, "<definitions version='1'/>")
+    calls = []
+    cache.load_or_build(make_build(calls, "v1"), extract)
+    wsdl.write_text("<definitions version='2'/>")
+    assert cache.load_or_build(make_build(calls, "v2"), extract).wsdl.marker == "v2"
+    assert calls == [None, None]
+    entries = list((tmp_path / "cache" / f"v{CACHE_FORMAT_VERSION}").glob("*.pkl"))
+    assert len(entries) == 1
+
+def test_unreadable_wsdl_builds_without_cache(tmp_path):
+    calls = []
+    cache = SchemaCache(str(tmp_path / "cache"), str(tmp_path / "missing.wsdl"))
+    assert cache.load_or_build(make_build(calls), extract).wsdl.marker == "parsed"
+    assert calls == [None]
+    assert not (tmp_path / "cache").exists()
+
+def test_corrupt_entry_is_rebuilt(tmp_path):
+    cache, _ = make_cache(tmp_path)
+    cache.directory.mkdir(parents=True)
+    (cache.directory / f"{cache.fingerprint()}.pkl").write_bytes(b"not a pickle")
+    calls = []
+    cache.load_or_build(make_build(calls), extract)
+    assert calls == [None]
+    assert cache._load(cache.directory / f"{cache.fingerprint()}.pkl").marker == "parsed"
+
+def test_unpicklable_schema_is_not_cached(tmp_path):
+    cache, _ = make_cache(tmp_path)
+    client = cache.load_or_build(lambda schema: FakeClient(Document(lambda: None)), extract)
+    assert callable(client.wsdl.marker)
+    assert not list(tmp_path.glob("cache/*/*.pkl"))
+
+def test_client_without_schema_is_not_cached(tmp_path):
+    cache, _ = make_cache(tmp_path)
+    cache.load_or_build(make_build([]), lambda client: None)
+    assert not list(tmp_path.glob("cache/*/*.pkl"))
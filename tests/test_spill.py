@@ -0,0 +1,119 @@
+import asyncio
+import json
+import os
+import types
+
+from fastapi.testclient import TestClient
+
+import src.aq_mcp_server as server
+import src.main as main_module
+from src.helpers.spill import SpillStore
+
+
+def make_store(tmp_path, request_budget=1000, global_budget=10_000, preview_items=2):
+    return SpillStore(str(tmp_path / "spill"), request_budget, global_budget, preview_items=preview_items)
+
+def test_small_result_stays_in_memory(tmp_path):
+    store = make_store(tmp_path)
+    rows, spilled = store.collect("tool", [{"a": 1}, {"a": 2}], dict)
+    assert rows == [{"a": 1}, {"a": 2}]
+    assert spilled is None
+    assert store.in_memory == 0
+
+def test_large_result_spills_to_disk(tmp_path):
+    store = make_store(tmp_path)
+    items = [{"id": i, "blob": "x" * 50} for i in range(100)]
+    preview, spilled = store.collect("get_event_history", iter(items), dict)
+    assert preview == items[:2]
+    assert spilled.total_items == 100
+    assert json.loads(spilled.path.read_text()) == items
+    assert store.get(spilled.result_id) is spilled
+    assert spilled.describe()["resource_uri"] == f"aquarium://results/{spilled.result_id}"
+    assert store.in_memory == 0
+
+def test_global_budget_forces_spill(tmp_path):
+    store = make_store(tmp_path, request_budget=10_000, global_budget=20)
+    _, spilled = store.collect("tool", [{"id": i} for i in range(10)], dict)
+    assert spilled is not None
+
+def test_expired_results_are_purged(tmp_path):
+    store = make_store(tmp_path, request_budget=10)
+    _, spilled = store.collect("tool", [{"id": i} for i in range(10)], dict)
+    store.ttl = -1
+    assert store.get(spilled.result_id) is None
+    store.purge_expired()
+    assert not spilled.path.exists()
+
+def test_read_page_stays_within_request_budget(tmp_path):
+    store = make_store(tmp_path, request_budget=200)
+    items = [{"id": i, "blob": "x" * 50} for i in range(20)]
+    _, spilled = store.collect("tool", items, dict)
+    pages, start = [], 0
+    while start is not None:
+        page = store.read_page(spilled, start)
+        assert page["items"] and len(json.dumps(page["items"])) <= 200
+        assert page["total_items"] == 20
+        pages.append(page)
+        start = page["next_start"]
+    assert [item for page in pages for item in page["items"]] == items
+    assert len(pages) > 1
+    assert store.in_memory == 0
+
+def test_reservation_holds_memory_until_exit(tmp_path):
+    store = make_store(tmp_path)
+    with store.reservation():
+        rows, _ = store.collect("tool", [{"a": 1}, {"a": 2}], dict)
+        assert store.in_memory > 0
+    assert store.in_memory == 0
+
+def test_same_payload_reuses_spill_file(tmp_path):
+    store = make_store(tmp_path, request_budget=10)
+    items = [{"id": i} for i in range(10)]
+    _, first = store.collect("tool", items, dict)
+    _, second = store.collect("tool", items, dict)
+    _, other = store.collect("other_tool", items, dict)
+    assert first.result_id == second.result_id != other.result_id
+    assert sorted(path.name for path in store.directory.iterdir()) == sorted(
+        [f"{first.result_id}.json", f"{other.result_id}.json"]
+    )
+
+def test_purge_removes_files_of_earlier_runs(tmp_path):
+    store = make_store(tmp_path)
+    store.directory.mkdir(parents=True)
+    stale = store.directory / "leftover.json"
+    stale.write_text("[]")
+    os.utime(stale, (0, 0))
+    fresh = store.directory / "recent.json"
+    fresh.write_text("[]")
+    store.purge_expired()
+    assert not stale.exists()
+    assert fresh.exists()
+
+def test_tool_returns_preview_and_uri(monkeypatch, tmp_path):
+    events = [types.SimpleNamespace(EventTypeID=i, Comments="x" * 50) for i in range(50)]
+    client = type("C", (), {"get_event_history": lambda self, case_id: events})()
+    monkeypatch.setattr(server, "aquarium_client", client)
+    monkeypatch.setattr(server, "spill_store", make_store(tmp_path))
+    result = asyncio.run(server.get_event_history(1))
+    assert result["truncated"] is True
+    assert result["total_items"] == 50
+    assert result["preview"] == [{"EventTypeID": 0, "Comments": "x" * 50}, {"EventTypeID": 1, "Comments": "x" * 50}]
+
+    result_id = result["resource_uri"].rsplit("/", 1)[-1]
+    page = json.loads(asyncio.run(server.spilled_result_resource(result_id)))
+    items = page["items"]
+    while page["next_start"] is not None:
+        start = page["next_uri"].rsplit("/", 1)[-1]
+        page = json.loads(asyncio.run(server.spilled_result_page_resource(result_id, start)))
+        assert len(json.dumps(page["items"])) <= 1000
+        items += page["items"]
+    assert [item["EventTypeID"] for item in items] == list(range(50))
+    assert server.spill_store.in_memory == 0
+
+    response = TestClient(main_module.app).get(result["url"])
+    assert response.status_code == 200
+    assert len(response.json()) == 50
+
+def test_unknown_result_returns_404():
+    response = TestClient(main_module.app).get("/aquarium/results/missing")
+    assert response.status_code == 404